@@ -0,0 +1,84 @@
+"""
+One-off migration: give every BillAction row an actionKey, then make the
+column NOT NULL so the unique (legislationId, actionKey) index covers all
+rows, not only those written since actionKey was added.
+
+Keys are computed with insert._action_key, exactly as ingestion does.
+Rows that duplicate an action already stored for the same bill are
+deleted; a row that already has the key is kept, otherwise the lowest id. Run it with ingestion stopped, before
+`prisma db push` with the NOT NULL schema:
+
+    python backfill_action_keys.py
+"""
+
+import asyncio
+import logging
+from insert import _action_key, connect_db, disconnect_db, prisma
+
+BATCH_SIZE = 1000  # Rows keyed per transaction
+
+logger = logging.getLogger(__name__)
+
+
+async def _stored_keys(legislation_ids: set[int]) -> set[tuple[int, str]]:
+    placeholders = ", ".join("?" for _ in legislation_ids)
+    rows = await prisma.query_raw(
+        "SELECT legislationId, actionKey FROM billaction "
+        f"WHERE actionKey IS NOT NULL AND legislationId IN ({placeholders})",
+        *legislation_ids,
+    )
+    return {(row["legislationId"], row["actionKey"]) for row in rows}
+
+
+async def backfill() -> tuple[int, int]:
+    """Key every unkeyed row; returns (rows keyed, duplicates deleted)."""
+    keyed = deleted = 0
+    last_id = 0
+    while True:
+        rows = await prisma.billaction.find_many(
+            where={"actionKey": None, "id": {"gt": last_id}},
+            order={"id": "asc"},
+            take=BATCH_SIZE,
+        )
+        if not rows:
+            return keyed, deleted
+        last_id = rows[-1].id
+
+        # Keyed rows win, then the lowest id (rows are visited in id order)
+        seen = await _stored_keys({row.legislationId for row in rows})
+        updates, duplicates = [], []
+        for row in rows:
+            action_key = _action_key(row.actionDate, row.type, row.actionCode, row.text)
+            key = (row.legislationId, action_key)
+            if key in seen:
+                duplicates.append(row.id)
+            else:
+                seen.add(key)
+                updates.append((row.id, action_key))
+
+        async with prisma.batch_() as batcher:
+            if duplicates:
+                batcher.billaction.delete_many(where={"id": {"in": duplicates}})
+            for row_id, action_key in updates:
+                batcher.billaction.update(where={"id": row_id}, data={"actionKey": action_key})
+        keyed += len(updates)
+        deleted += len(duplicates)
+        logger.info(f"Keyed {keyed} actions, deleted {deleted} duplicates (id <= {last_id})")
+
+
+async def main():
+    await connect_db()
+    try:
+        keyed, deleted = await backfill()
+        await prisma.execute_raw("ALTER TABLE billaction MODIFY actionKey CHAR(64) NOT NULL")
+        logger.info(
+            f"Backfill done: {keyed} actions keyed, {deleted} duplicates deleted; "
+            f"actionKey is now NOT NULL"
+        )
+    finally:
+        await disconnect_db()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    asyncio.run(main())
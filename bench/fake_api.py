@@ -0,0 +1,458 @@
+"""
+Local stand-in for the Congress.gov v3 API, for benchmarks.
+
+Serves every endpoint the ingestion pipeline calls. Responses are replayed
+from a recorded response archive (see response_archive.py) when one is
+given and has the request, and generated deterministically otherwise.
+Latency, 429s and large payloads (500-action bills, 435-member roll calls)
+are injected according to FakeAPIConfig. Request counters are served at
+/_bench/stats, outside the API and its injected latency.
+
+    python -m bench.fake_api --port 8765 --bills 500 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from aiohttp import web
+from response_archive import ResponseArchive, classify
+from response_cache import cache_key
+
+RECORDED_BASE_URL = "https://api.congress.gov/v3"
+HOUSE_SIZE = 435
+BILL_TYPES = ("HR", "S", "HRES", "SRES", "HJRES", "SJRES", "HCONRES", "SCONRES")
+POLICY_AREAS = ("Health", "Taxation", "Armed Forces and National Security", "Education")
+STATES = ("CA", "TX", "NY", "FL", "PA", "OH", "IL", "GA", "NC", "MI")
+PARTIES = (("Democratic", "D"), ("Republican", "R"))
+VOTE_CASTS = ("Yea", "Nay", "Present", "Not Voting")
+RELATIONSHIPS = ("Related bill", "Identical bill", "Procedurally-related")
+
+
+class FakeAPIConfig:
+    def __init__(
+        self,
+        bills: int = 200,
+        actions_per_bill: int = 12,
+        large_bill_every: int = 20,
+        large_bill_actions: int = 500,
+        summaries_per_bill: int = 2,
+        cosponsors_per_bill: int = 15,
+        related_per_bill: int = 3,
+        roll_calls_per_house_bill: int = 1,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        rate_429: float = 0,
+        retry_after: int = 1,
+        seed: int = 1,
+        fixtures: Path | None = None,
+    ):
+        self.bills = bills
+        self.actions_per_bill = actions_per_bill
+        self.large_bill_every = large_bill_every  # Every Nth bill gets large_bill_actions
+        self.large_bill_actions = large_bill_actions
+        self.summaries_per_bill = summaries_per_bill
+        self.cosponsors_per_bill = cosponsors_per_bill
+        self.related_per_bill = related_per_bill
+        self.roll_calls_per_house_bill = roll_calls_per_house_bill
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.seed = seed
+        self.fixtures = fixtures
+
+    def as_dict(self) -> dict:
+        return {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(self).items()
+        }
+
+
+def _paginate(request: web.Request, items: list) -> tuple[list, dict]:
+    limit = int(request.query.get("limit", 20))
+    offset = int(request.query.get("offset", 0))
+    pagination = {"count": len(items)}
+    if offset + limit < len(items):
+        pagination["next"] = f"{request.url.with_query({'offset': offset + limit, 'limit': limit})}"
+    return items[offset : offset + limit], pagination
+
+
+def _bioguide_id(index: int) -> str:
+    return f"B{index % HOUSE_SIZE:06d}"
+
+
+class FakeCongressAPI:
+    """aiohttp app plus per-endpoint request counters."""
+
+    def __init__(self, config: FakeAPIConfig):
+        self.config = config
+        self.requests: Counter = Counter()
+        self.throttled = 0
+        self.replayed = 0
+        self._rng = random.Random(config.seed)
+        self._archive = None
+        if config.fixtures is not None:
+            self._archive = ResponseArchive(config.fixtures, 0)
+            self._archive.open()
+        self._runner: web.AppRunner | None = None
+
+        app = web.Application(middlewares=[self._inject])
+        app.router.add_get("/v3/bill/{congress}", self.bill_list)
+        app.router.add_get("/v3/bill/{congress}/{type}/{number}", self.bill_detail)
+        app.router.add_get("/v3/bill/{congress}/{type}/{number}/actions", self.bill_actions)
+        app.router.add_get("/v3/bill/{congress}/{type}/{number}/summaries", self.bill_summaries)
+        app.router.add_get("/v3/bill/{congress}/{type}/{number}/cosponsors", self.bill_cosponsors)
+        app.router.add_get("/v3/bill/{congress}/{type}/{number}/relatedbills", self.bill_related)
+        app.router.add_get("/v3/bill/{congress}/{type}/{number}/house-votes", self.bill_house_votes)
+        app.router.add_get(
+            "/v3/house-vote/{congress}/{session}/{roll}/members", self.vote_members
+        )
+        app.router.add_get("/v3/member/{bioguide_id}", self.member)
+        app.router.add_get("/_bench/stats", self.stats)
+        self.app = app
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; returns the base URL to use as CONGRESS_API_BASE_URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}/v3"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._archive is not None:
+            self._archive.close()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    async def stats(self, request: web.Request):
+        return web.json_response(
+            {
+                "requests": dict(self.requests),
+                "total_requests": self.total_requests,
+                "throttled": self.throttled,
+                "replayed": self.replayed,
+            }
+        )
+
+    # ── Injection ─────────────────────────────────────────────────────────────
+
+    @web.middleware
+    async def _inject(self, request: web.Request, handler):
+        if request.path.startswith("/_bench/"):
+            return await handler(request)
+        endpoint, _ = classify(str(request.url))
+        self.requests[endpoint] += 1
+
+        delay = self.config.latency_ms
+        if self.config.jitter_ms:
+            delay += self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.config.rate_429 and self._rng.random() < self.config.rate_429:
+            self.throttled += 1
+            return web.json_response(
+                {"error": "rate limited"},
+                status=429,
+                headers={"Retry-After": str(self.config.retry_after)},
+            )
+
+        recorded = self._recorded(request)
+        if recorded is not None:
+            self.replayed += 1
+            return web.Response(body=recorded, content_type="application/json")
+        return await handler(request)
+
+    def _recorded(self, request: web.Request) -> bytes | None:
+        if self._archive is None:
+            return None
+        url = RECORDED_BASE_URL + request.path.removeprefix("/v3")
+        return self._archive.read(cache_key(url, dict(request.query)))
+
+    # ── Synthetic payloads ────────────────────────────────────────────────────
+
+    def _bill_rng(self, request: web.Request) -> random.Random:
+        """Per-bill RNG so every endpoint of a bill agrees, whatever the order."""
+        info = request.match_info
+        key = f"{info['congress']}/{info['type'].upper()}/{info['number']}"
+        return random.Random(zlib.crc32(key.encode()) ^ self.config.seed)
+
+    def _bill_ref(self, congress: int, index: int) -> dict:
+        bill_type = BILL_TYPES[index % len(BILL_TYPES)]
+        number = index // len(BILL_TYPES) + 1
+        return {
+            "congress": congress,
+            "type": bill_type,
+            "number": str(number),
+            "title": f"Benchmark bill {bill_type} {number}",
+            "updateDate": f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}T12:00:00Z",
+            "url": f"{RECORDED_BASE_URL}/bill/{congress}/{bill_type.lower()}/{number}",
+        }
+
+    def _actions_count(self, request: web.Request) -> int:
+        number = int(request.match_info["number"])
+        if self.config.large_bill_every and number % self.config.large_bill_every == 0:
+            return self.config.large_bill_actions
+        return self.config.actions_per_bill
+
+    def _is_house_bill(self, request: web.Request) -> bool:
+        return request.match_info["type"].upper() in ("HR", "HRES", "HJRES", "HCONRES")
+
+    async def bill_list(self, request: web.Request):
+        congress = int(request.match_info["congress"])
+        bills = [self._bill_ref(congress, index) for index in range(self.config.bills)]
+        page, pagination = _paginate(request, bills)
+        return web.json_response({"bills": page, "pagination": pagination})
+
+    async def bill_detail(self, request: web.Request):
+        info = request.match_info
+        rng = self._bill_rng(request)
+        congress = int(info["congress"])
+        bill_type = info["type"].upper()
+        actions = self._actions_count(request)
+        bill = {
+            "congress": congress,
+            "type": bill_type,
+            "number": info["number"],
+            "title": f"Benchmark bill {bill_type} {info['number']}",
+            "introducedDate": "2024-01-03",
+            "updateDate": "2024-06-01T12:00:00Z",
+            "url": str(request.url),
+            "policyArea": {"name": rng.choice(POLICY_AREAS)},
+            "sponsors": [{"bioguideId": _bioguide_id(rng.randrange(HOUSE_SIZE))}],
+            "actions": {"count": actions},
+            "summaries": {"count": self.config.summaries_per_bill},
+            "cosponsors": {"count": self.config.cosponsors_per_bill},
+            "latestAction": {"actionDate": "2024-06-01", "text": f"Action {actions - 1}"},
+        }
+        if self.config.related_per_bill:
+            bill["relatedBills"] = {"count": self.config.related_per_bill}
+        return web.json_response({"bill": bill})
+
+    async def bill_actions(self, request: web.Request):
+        count = self._actions_count(request)
+        actions = [
+            {
+                "actionDate": f"2024-{(count - i) % 12 + 1:02d}-{(count - i) % 28 + 1:02d}",
+                "text": f"Action {count - 1 - i}",
+                "type": "IntroReferral" if i == count - 1 else "Floor",
+                "actionCode": f"H{count - i:05d}",
+            }
+            for i in range(count)
+        ]
+        page, pagination = _paginate(request, actions)
+        return web.json_response({"actions": page, "pagination": pagination})
+
+    async def bill_summaries(self, request: web.Request):
+        summaries = [
+            {
+                "actionDate": "2024-02-01",
+                "actionDesc": "Introduced in House",
+                "text": f"<p>Summary version {i}. " + "Lorem ipsum dolor sit amet. " * 40 + "</p>",
+                "updateDate": "2024-06-01T12:00:00Z",
+                "versionCode": f"{i:02d}",
+            }
+            for i in range(self.config.summaries_per_bill)
+        ]
+        page, pagination = _paginate(request, summaries)
+        return web.json_response({"summaries": page, "pagination": pagination})
+
+    async def bill_cosponsors(self, request: web.Request):
+        rng = self._bill_rng(request)
+        members = rng.sample(range(HOUSE_SIZE), min(self.config.cosponsors_per_bill, HOUSE_SIZE))
+        cosponsors = [{"bioguideId": _bioguide_id(m), "isOriginalCosponsor": True} for m in members]
+        page, pagination = _paginate(request, cosponsors)
+        return web.json_response({"cosponsors": page, "pagination": pagination})
+
+    async def bill_related(self, request: web.Request):
+        rng = self._bill_rng(request)
+        congress = int(request.match_info["congress"])
+        related = []
+        for _ in range(self.config.related_per_bill):
+            ref = self._bill_ref(congress, rng.randrange(max(self.config.bills, 1)))
+            related.append(
+                {
+                    "congress": congress,
+                    "type": ref["type"],
+                    "number": int(ref["number"]),
+                    "title": ref["title"],
+                    "relationshipDetails": [
+                        {"type": rng.choice(RELATIONSHIPS), "identifiedBy": "House"}
+                    ],
+                }
+            )
+        page, pagination = _paginate(request, related)
+        return web.json_response({"relatedBills": page, "pagination": pagination})
+
+    async def bill_house_votes(self, request: web.Request):
+        info = request.match_info
+        votes = []
+        if self._is_house_bill(request):
+            # Unique per bill: bill numbers repeat across bill types
+            first_roll = (
+                int(info["number"]) * len(BILL_TYPES) + BILL_TYPES.index(info["type"].upper())
+            ) * self.config.roll_calls_per_house_bill
+            for i in range(self.config.roll_calls_per_house_bill):
+                votes.append(
+                    {
+                        "congress": int(info["congress"]),
+                        "sessionNumber": 1,
+                        "rollCallNumber": first_roll + i,
+                        "legislationType": info["type"].upper(),
+                        "legislationNumber": info["number"],
+                        "voteQuestion": "On Passage",
+                        "result": "Passed",
+                        "startDate": "2024-05-01T14:00:00Z",
+                    }
+                )
+        page, pagination = _paginate(request, votes)
+        return web.json_response({"houseRollCallVotes": page, "pagination": pagination})
+
+    async def vote_members(self, request: web.Request):
+        roll = int(request.match_info["roll"])
+        rng = random.Random(roll ^ self.config.seed)
+        results = []
+        for index in range(HOUSE_SIZE):
+            _, party = PARTIES[index % 2]
+            results.append(
+                {
+                    "bioguideID": _bioguide_id(index),
+                    "voteCast": rng.choice(VOTE_CASTS),
+                    "voteParty": party,
+                    "voteState": STATES[index % len(STATES)],
+                }
+            )
+        page, pagination = _paginate(request, results)
+        return web.json_response(
+            {
+                "houseRollCallVoteMemberVotes": {
+                    "congress": int(request.match_info["congress"]),
+                    "sessionNumber": int(request.match_info["session"]),
+                    "rollCallNumber": roll,
+                    "results": page,
+                },
+                "pagination": pagination,
+            }
+        )
+
+    async def member(self, request: web.Request):
+        bioguide_id = request.match_info["bioguide_id"]
+        index = int(bioguide_id[1:]) if bioguide_id[1:].isdigit() else 0
+        party_name, _ = PARTIES[index % 2]
+        return web.json_response(
+            {
+                "member": {
+                    "bioguideId": bioguide_id,
+                    "directOrderName": f"Member {index}",
+                    "firstName": "Member",
+                    "lastName": str(index),
+                    "state": STATES[index % len(STATES)],
+                    "partyHistory": [{"partyName": party_name}],
+                    "currentMember": True,
+                }
+            }
+        )
+
+
+def config_args(parser: argparse.ArgumentParser):
+    """Add the FakeAPIConfig options to a parser (shared with run_bench)."""
+    defaults = FakeAPIConfig()
+    parser.add_argument("--bills", type=int, default=defaults.bills)
+    parser.add_argument("--actions-per-bill", type=int, default=defaults.actions_per_bill)
+    parser.add_argument(
+        "--large-bill-every",
+        type=int,
+        default=defaults.large_bill_every,
+        help="every Nth bill number gets --large-bill-actions actions (0 disables)",
+    )
+    parser.add_argument("--large-bill-actions", type=int, default=defaults.large_bill_actions)
+    parser.add_argument("--summaries-per-bill", type=int, default=defaults.summaries_per_bill)
+    parser.add_argument("--cosponsors-per-bill", type=int, default=defaults.cosponsors_per_bill)
+    parser.add_argument("--related-per-bill", type=int, default=defaults.related_per_bill)
+    parser.add_argument(
+        "--roll-calls-per-house-bill", type=int, default=defaults.roll_calls_per_house_bill
+    )
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument(
+        "--rate-429", type=float, default=defaults.rate_429, help="fraction of requests answered 429"
+    )
+    parser.add_argument("--retry-after", type=int, default=defaults.retry_after)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        default=None,
+        help="response archive directory to replay recorded responses from",
+    )
+
+
+def config_argv(config: FakeAPIConfig) -> list[str]:
+    """Command-line flags (as added by config_args) that rebuild `config`."""
+    argv = []
+    for key, value in config.as_dict().items():
+        if value is not None:
+            argv += [f"--{key.replace('_', '-')}", str(value)]
+    return argv
+
+
+def config_from_args(args: argparse.Namespace) -> FakeAPIConfig:
+    return FakeAPIConfig(
+        bills=args.bills,
+        actions_per_bill=args.actions_per_bill,
+        large_bill_every=args.large_bill_every,
+        large_bill_actions=args.large_bill_actions,
+        summaries_per_bill=args.summaries_per_bill,
+        cosponsors_per_bill=args.cosponsors_per_bill,
+        related_per_bill=args.related_per_bill,
+        roll_calls_per_house_bill=args.roll_calls_per_house_bill,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        fixtures=args.fixtures,
+    )
+
+
+async def _serve(config: FakeAPIConfig, port: int):
+    api = FakeCongressAPI(config)
+    base_url = await api.start(port=port)
+    # First line is read by bench.run_bench to find the port
+    print(f"Fake Congress.gov API at {base_url} (CONGRESS_API_BASE_URL={base_url})", flush=True)
+    started = time.monotonic()
+    try:
+        while True:
+            await asyncio.sleep(30)
+            elapsed = time.monotonic() - started
+            print(
+                f"{api.total_requests} requests ({api.throttled} throttled, "
+                f"{api.replayed} replayed) in {elapsed:.0f}s",
+                flush=True,
+            )
+    finally:
+        await api.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    config_args(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(config_from_args(args), args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,296 @@
+"""
+Ingestion benchmark: congress_bills.main against the local fake API.
+
+Starts bench.fake_api in a subprocess, so serving it costs the measured
+process nothing, and points the pipeline at it through CONGRESS_API_BASE_URL
+with the HTTP cache and archive off. Every row of the synthetic congress is
+deleted first, and then one fresh, full import of it is timed against the
+database in DATABASE_URL. Use a scratch database. Congress members and
+policy areas are shared reference data and are kept, so the first run on a
+new database also creates them; compare the runs after it.
+
+Reports bills/min, API requests per bill, DB queries per bill (MySQL's
+`Questions` counter, so keep other clients off the database), p50/p99
+latency per stage and peak RSS, and saves them as JSON under
+bench/results/ for comparison across commits.
+
+    python -m bench.run_bench --bills 400 --latency-ms 50 --rate-429 0.01
+    python -m bench.run_bench --compare bench/results/a.json bench/results/b.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Pipeline settings for a clean, uncached full import. Set before anything
+# imports the repo modules, which read them at import time; dotenv does not
+# override them.
+os.environ["HTTP_CACHE"] = "false"
+os.environ["RESPONSE_ARCHIVE"] = "false"
+os.environ["FORCE_REPROCESS"] = "true"
+os.environ["INCREMENTAL_SYNC"] = "false"
+os.environ["REPLAY_ARCHIVE"] = "false"
+
+from bench.fake_api import config_args, config_argv, config_from_args  # noqa: E402
+
+REPO_DIR = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+BENCH_CONGRESS = 990  # Synthetic congress, so bench rows never mix with real ones
+
+# Metrics where a higher value is better, for --compare
+HIGHER_IS_BETTER = {"bills_per_min"}
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+async def start_fake_api(config) -> tuple[asyncio.subprocess.Process, str]:
+    """Run bench.fake_api on a free port; returns the process and its base URL."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "bench.fake_api",
+        "--port",
+        "0",
+        *config_argv(config),
+        cwd=REPO_DIR,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    line = (await process.stdout.readline()).decode()
+    match = re.search(r" at (\S+)", line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"fake API did not start: {line!r}")
+    return process, match.group(1)
+
+
+async def stop_fake_api(process: asyncio.subprocess.Process, base_url: str) -> dict:
+    """Read the server's request counters, then stop it."""
+    stats_url = base_url.rsplit("/v3", 1)[0] + "/_bench/stats"
+    try:
+        stats = await asyncio.to_thread(
+            lambda: json.loads(urllib.request.urlopen(stats_url, timeout=10).read())
+        )
+    finally:
+        process.terminate()
+        await process.wait()
+    return stats
+
+
+async def reset_congress(prisma, congress: int):
+    """Delete everything a previous run ingested for the bench congress."""
+    legislation = "SELECT id FROM legislation WHERE congress = ?"
+    statements = [
+        "DELETE mv FROM membervote mv JOIN vote v ON v.id = mv.voteId WHERE v.congress = ?",
+        "DELETE FROM vote WHERE congress = ?",
+        f"DELETE FROM latestaction WHERE legislation_id IN ({legislation})",
+        f"DELETE FROM legislationsponsor WHERE legislationId IN ({legislation})",
+        f"DELETE FROM legislationcosponsor WHERE legislationId IN ({legislation})",
+        f"DELETE FROM relatedlegislation WHERE legislationId IN ({legislation})",
+        f"DELETE FROM billsummary WHERE legislationId IN ({legislation})",
+        f"DELETE FROM billaction WHERE legislationId IN ({legislation})",
+        "DELETE FROM legislation WHERE congress = ?",
+        "DELETE FROM ingestcheckpoint WHERE congress = ?",
+        "DELETE FROM ingestlease WHERE congress = ?",
+        "DELETE FROM synccursor WHERE congress = ?",
+    ]
+    deleted = 0
+    for statement in statements:
+        deleted += await prisma.execute_raw(statement, congress)
+    print(f"reset congress {congress}: deleted {deleted} rows")
+
+
+async def _mysql_questions(prisma) -> int | None:
+    try:
+        rows = await prisma.query_raw("SHOW GLOBAL STATUS LIKE 'Questions'")
+    except Exception:
+        return None
+    return int(rows[0]["Value"]) if rows else None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    config = config_from_args(args)
+    fake_api, base_url = await start_fake_api(config)
+
+    # The pipeline is imported only once the server's URL is known
+    os.environ["CONGRESS_API_BASE_URL"] = base_url
+    os.environ.setdefault("CONGRESS_API_KEY", "bench")
+    os.environ["CONGRESS_API_HOURLY_QUOTA"] = str(args.quota)
+    os.environ["CONGRESS_API_BURST"] = str(args.burst)
+
+    import congress_bills
+    from insert import connect_db, disconnect_db, prisma
+
+    stage_latencies: dict[str, list[float]] = defaultdict(list)
+    run_stage = congress_bills._run_stage
+
+    async def timed_run_stage(checkpoints, name_id, stage, coro):
+        started = time.perf_counter()
+        try:
+            return await run_stage(checkpoints, name_id, stage, coro)
+        finally:
+            stage_latencies[stage].append((time.perf_counter() - started) * 1000)
+
+    congress_bills._run_stage = timed_run_stage
+
+    try:
+        await connect_db()
+        await reset_congress(prisma, args.congress)
+        questions_before = await _mysql_questions(prisma)
+
+        started = time.perf_counter()
+        runs = await congress_bills.main([args.congress], args.concurrency)
+        elapsed = time.perf_counter() - started
+
+        await connect_db()
+        questions_after = await _mysql_questions(prisma)
+        await disconnect_db()
+    finally:
+        api = await stop_fake_api(fake_api, base_url)
+
+    counters = runs[0].counters if runs else {}
+    bills = counters.get("done", 0)
+    db_queries = (
+        questions_after - questions_before
+        if questions_before is not None and questions_after is not None
+        else None
+    )
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": args.label,
+        "congress": args.congress,
+        "concurrency": args.concurrency,
+        "fake_api": config.as_dict(),
+        "metrics": {
+            "bills": bills,
+            "bills_succeeded": counters.get("success", 0),
+            "bills_failed": counters.get("fail", 0),
+            "elapsed_s": round(elapsed, 2),
+            "bills_per_min": round(bills / elapsed * 60, 1) if elapsed else None,
+            "requests": api["total_requests"],
+            "requests_throttled": api["throttled"],
+            "requests_per_bill": round(api["total_requests"] / bills, 2) if bills else None,
+            "db_queries": db_queries,
+            "db_queries_per_bill": round(db_queries / bills, 2)
+            if bills and db_queries is not None
+            else None,
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        },
+        "requests_by_endpoint": dict(sorted(api["requests"].items())),
+        "stage_latency_ms": {
+            stage: {
+                "count": len(values),
+                "p50": round(_percentile(values, 50), 1),
+                "p99": round(_percentile(values, 99), 1),
+            }
+            for stage, values in sorted(stage_latencies.items())
+        },
+    }
+
+
+def save(result: dict) -> Path:
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    name = "_".join(part for part in (stamp, result["commit"], result["label"]) if part)
+    path = RESULTS_DIR / f"{name}.json"
+    path.write_text(json.dumps(result, indent=2) + "\n")
+    return path
+
+
+def print_result(result: dict):
+    metrics = result["metrics"]
+    print(f"\ncommit {result['commit']}  congress {result['congress']}  "
+          f"concurrency {result['concurrency']}")
+    for key, value in metrics.items():
+        print(f"  {key:<22} {value}")
+    print("  stage latency (ms)")
+    for stage, latency in result["stage_latency_ms"].items():
+        print(f"    {stage:<11} n={latency['count']:<6} p50={latency['p50']:<9} p99={latency['p99']}")
+
+
+def compare(baseline_path: Path, candidate_path: Path):
+    baseline = json.loads(baseline_path.read_text())
+    candidate = json.loads(candidate_path.read_text())
+    print(f"{'metric':<28} {baseline['commit'] or 'baseline':>12} {candidate['commit'] or 'candidate':>12}  change")
+
+    def row(name: str, old, new, higher_is_better: bool):
+        if old is None or new is None:
+            print(f"{name:<28} {str(old):>12} {str(new):>12}")
+            return
+        change = (new - old) / old * 100 if old else 0
+        better = change > 0 if higher_is_better else change < 0
+        marker = "" if abs(change) < 1 else (" better" if better else " worse")
+        print(f"{name:<28} {old:>12} {new:>12}  {change:+.1f}%{marker}")
+
+    for key, old in baseline["metrics"].items():
+        row(key, old, candidate["metrics"].get(key), key in HIGHER_IS_BETTER)
+    stages = sorted(set(baseline["stage_latency_ms"]) | set(candidate["stage_latency_ms"]))
+    for stage in stages:
+        for pct in ("p50", "p99"):
+            row(
+                f"{stage} {pct} ms",
+                baseline["stage_latency_ms"].get(stage, {}).get(pct),
+                candidate["stage_latency_ms"].get(stage, {}).get(pct),
+                False,
+            )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark bill ingestion against a fake API.")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASELINE", "CANDIDATE"))
+    parser.add_argument("--congress", type=int, default=BENCH_CONGRESS)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--quota",
+        type=int,
+        default=10_000_000,
+        help="hourly request budget for the rate limiter (default: effectively unlimited)",
+    )
+    parser.add_argument("--burst", type=int, default=1000)
+    parser.add_argument("--label", default="", help="suffix for the results file name")
+    parser.add_argument("--no-save", action="store_true")
+    config_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        result = asyncio.run(run(args))
+        print_result(result)
+        if not args.no_save:
+            print(f"\nsaved {save(result)}")
@@ -1,12 +1,14 @@
-import requests
 import os
 import asyncio
 import json
-import time
 from datetime import datetime
 from dotenv import load_dotenv
 from variables import VALID_BILL_TYPES
 from insert import prisma
+from member_index import member_index
+import http_client
+from http_client import API_BASE_URL
+from response_cache import current_congress
 
 import logging
 from insert import (
@@ -15,15 +17,21 @@ from insert import (
     upsert_bill_details,
     insert_bill_actions,
     insert_bill_summaries,
-    insert_house_vote,
+    insert_bill_cosponsors,
+    insert_bill_related_bills,
+    upsert_house_votes,
     insert_member_votes,
+    load_policy_areas,
+    load_legislation_index,
+    load_latest_actions,
+    bill_update_date,
 )
 
 load_dotenv()
 
 CONGRESS_API_KEY = os.getenv("CONGRESS_API_KEY")
-CONGRESS_NUMBER = 119
-RATE_LIMIT_SLEEP = 60 * 30  # 30 minute backoff for API 429
+# Latest bills and house votes come from this congress (default: the current one)
+CONGRESS_NUMBER = int(os.getenv("CONGRESS_NUMBER", current_congress()))
 REQUEST_TIMEOUT = 20
 
 
@@ -48,32 +56,27 @@ def setup_logger():
 logger = logging.getLogger(__name__)
 
 
-async def _request_with_429_retry(url: str, params: dict, context: str):
-    """Retry the same request when Congress API returns 429."""
-    while True:
-        try:
-            response = await asyncio.to_thread(
-                requests.get, url, params=params, timeout=REQUEST_TIMEOUT
-            )
-        except requests.exceptions.RequestException as e:
-            logger.error(f"{context}: request error: {e}")
-            return None
-
-        if response.status_code == 429:
-            logger.warning(
-                f"{context}: got 429 rate limit; sleeping {RATE_LIMIT_SLEEP // 60} minutes then retrying"
-            )
-            await asyncio.sleep(RATE_LIMIT_SLEEP)
-            continue
-
-        return response
+async def _request_with_429_retry(
+    url: str, params: dict, context: str, changed_since: datetime | None = None
+):
+    """
+    GET through the shared client; 429s are retried there under the global
+    rate limiter. Returns None on network errors.
+    """
+    try:
+        return await http_client.get(
+            url, params, timeout=REQUEST_TIMEOUT, changed_since=changed_since
+        )
+    except http_client.RequestError as e:
+        logger.error(f"{context}: request error: {e}")
+        return None
 
 
 async def fetchLatestBills():
-    url = f"https://api.congress.gov/v3/bill/{119}"
+    url = f"{API_BASE_URL}/bill/{CONGRESS_NUMBER}"
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
     try:
-        response = requests.get(url, params=params)
+        response = await http_client.get(url, params)
         if response.status_code == 200:
             res = response.json()
             await processLatestBillsData(res)
@@ -82,7 +85,7 @@ async def fetchLatestBills():
             print("Something went wrong", response.status_code)
             logger.error(f"Failed to fetch bills: {response.status_code}")
             return None
-    except requests.exceptions.RequestException as e:
+    except http_client.RequestError as e:
         print("Real error", e)
         logger.error(f"request error {e}")
         return None
@@ -128,82 +131,80 @@ async def processLatestBillsData(data):
     logger.info(f"Completed: {success_count} successful, {fail_count} failed")
 
 
-async def fetchBillRelatedBills(bill):
+async def fetchBillRelatedBills(bill, legislation_id=None, related_count=None):
+    """
+    Pass the detail payload's `related_count`: when it is 0 stale rows are
+    pruned without a request.
+    """
     bill_congress = bill["congress"]
     bill_type = bill["type"]
     bill_number = bill["number"]
     if bill_type not in VALID_BILL_TYPES:
         return
-    url = f"https://api.congress.gov/v3/bill/{bill_congress}/{bill_type}/{bill_number}/relatedbills"
+    if related_count == 0:
+        return await insert_bill_related_bills(bill, {"relatedBills": []}, legislation_id)
+    url = f"{API_BASE_URL}/bill/{bill_congress}/{bill_type.lower()}/{bill_number}/relatedbills"
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
-    response = await asyncio.to_thread(requests.get, url, params=params)
-    if response.status_code == 200:
-        res = response.json()
-        dumped = json.dumps(res, indent=4)
-        print(dumped)
-    else:
-        print("couldnt fetch the relatedbills", response.status_code, response.text)
-    time.sleep(1)
+    # Every page is needed: insert_bill_related_bills prunes what it doesn't see
+    res = await http_client.get_paginated(
+        url, params, ("relatedBills",), REQUEST_TIMEOUT, bill_update_date(bill)
+    )
+    if res is None:
+        logger.error(f"couldnt fetch the relatedbills for {bill_congress}/{bill_type}/{bill_number}")
+        return None
+    return await insert_bill_related_bills(bill, res, legislation_id)
 
 
-async def fetchBillCosponsors(bill):
+async def fetchBillCosponsors(bill, legislation_id=None):
     bill_congress = bill["congress"]
     bill_type = bill["type"]
     bill_number = bill["number"]
     if bill_type not in VALID_BILL_TYPES:
         return
-    url = f"https://api.congress.gov/v3/bill/{bill_congress}/{bill_type}/{bill_number}/cosponsors"
+    url = f"{API_BASE_URL}/bill/{bill_congress}/{bill_type.lower()}/{bill_number}/cosponsors"
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
-    response = await asyncio.to_thread(requests.get, url, params=params)
-    if response.status_code == 200:
-        res = response.json()
-        dumped = json.dumps(res, indent=4)
-        print(dumped)
-    else:
-        print("something went wrong", response.status_code, response.text)
-    time.sleep(1)
+    # Every page is needed: insert_bill_cosponsors removes anyone it doesn't see
+    res = await http_client.get_paginated(
+        url, params, ("cosponsors",), REQUEST_TIMEOUT, bill_update_date(bill)
+    )
+    if res is None:
+        logger.error(f"couldnt fetch the cosponsors for {bill_congress}/{bill_type}/{bill_number}")
+        return None
+    return await insert_bill_cosponsors(bill, res, legislation_id)
 
 
-async def fetchBillSummaries(bill):
+async def fetchBillSummaries(bill, legislation_id=None):
     bill_congress = bill["congress"]
     bill_type = bill["type"]
     bill_number = bill["number"]
     if bill_type not in VALID_BILL_TYPES:
         return
-    url = f"https://api.congress.gov/v3/bill/{bill_congress}/{bill_type.lower()}/{bill_number}/summaries"
+    url = f"{API_BASE_URL}/bill/{bill_congress}/{bill_type.lower()}/{bill_number}/summaries"
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
-    response = await _request_with_429_retry(url, params, "fetchBillSummaries")
-    if response is None:
+    res = await http_client.get_paginated(
+        url, params, ("summaries",), REQUEST_TIMEOUT, bill_update_date(bill)
+    )
+    if res is None:
+        logger.error(f"couldnt fetch the summary data for {bill_congress}/{bill_type}/{bill_number}")
         return None
-    if response.status_code == 200:
-        res = response.json()
-        if res:
-            legislation = await insert_bill_summaries(bill, res)
-            return legislation
-    else:
-        print("couldnt fetch the summary data", response.status_code, response.text)
-    time.sleep(1)
+    return await insert_bill_summaries(bill, res, legislation_id)
 
 
-async def fetchBillActions(bill):
+async def fetchBillActions(bill, legislation_id=None):
     bill_congress = bill["congress"]
     bill_type = bill["type"]
     bill_number = bill["number"]
     if bill_type not in VALID_BILL_TYPES:
         return
-    url = f"https://api.congress.gov/v3/bill/{bill_congress}/{bill_type.lower()}/{bill_number}/actions"
+    url = f"{API_BASE_URL}/bill/{bill_congress}/{bill_type.lower()}/{bill_number}/actions"
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
-    response = await _request_with_429_retry(url, params, "fetchBillActions")
-    if response is None:
+    res = await http_client.get_paginated(
+        url, params, ("actions",), REQUEST_TIMEOUT, bill_update_date(bill)
+    )
+    if res is None:
+        logger.error(f"couldnt fetch the action data for {bill_congress}/{bill_type}/{bill_number}")
         return None
-    if response.status_code == 200:
-        res = response.json()
-        if res:
-            legislation = await insert_bill_actions(bill, res)
-            return legislation
-    else:
-        print("couldnt fetch the action data", response.status_code, response.text)
-    time.sleep(1)
+    return await insert_bill_actions(bill, res, legislation_id)
 
 
 async def fetchBillDetails(bill):
@@ -212,9 +213,14 @@ async def fetchBillDetails(bill):
     bill_number = bill["number"]
     if bill_type not in VALID_BILL_TYPES:
         return
-    url = f"https://api.congress.gov/v3/bill/{bill_congress}/{bill_type}/{bill_number}"
+    url = f"{API_BASE_URL}/bill/{bill_congress}/{bill_type}/{bill_number}"
     params = params = {"api_key": CONGRESS_API_KEY}
-    response = await _request_with_429_retry(url, params, f"fetchBillDetails {bill_congress}/{bill_type}/{bill_number}")
+    response = await _request_with_429_retry(
+        url,
+        params,
+        f"fetchBillDetails {bill_congress}/{bill_type}/{bill_number}",
+        bill_update_date(bill),
+    )
     if response is None:
         return None
     if response.status_code == 200:
@@ -233,15 +239,13 @@ async def fetchBillDetails(bill):
         logger.warning("No bill data in response")
         return None
 
-    time.sleep(1)
-
 
 async def fetchHouseVotes():
-    url = f"https://api.congress.gov/v3/house-vote/{CONGRESS_NUMBER}"
+    url = f"{API_BASE_URL}/house-vote/{CONGRESS_NUMBER}"
     params = {"api_key": CONGRESS_API_KEY, "format": "json", "limit": 250, "offset": 0}
 
     try:
-        response = requests.get(url, params=params)
+        response = await http_client.get(url, params)
         if response.status_code == 200:
             res = response.json()
             dumped = json.dumps(res, indent=2)
@@ -252,7 +256,7 @@ async def fetchHouseVotes():
             print("Something went wrong fetching house votes", response.status_code)
             logger.error(f"Failed to fetch house votes: {response.status_code}")
             return None
-    except requests.exceptions.RequestException as e:
+    except http_client.RequestError as e:
         print("Real error", e)
         logger.error(f"request error {e}")
         return None
@@ -263,12 +267,12 @@ async def processHouseVotes(data):
     total_votes = len(votes_data)
     logger.info(f"processing {total_votes} house votes")
 
-    # Fetch ALL congress members once at the start using the imported function
-    logger.info("Loading all congress members into cache...")
-    from insert import prisma  # Import prisma from insert module
+    # Compact bioguideId -> (id, party, state) index; unknown members load lazily
+    await member_index.load()
+    member_cache = member_index
 
-    all_members = await prisma.congressmember.find_many()
-    member_cache = {cm.bioguideId: cm for cm in all_members}
+    # Upsert the whole page of votes in a few batched queries
+    stored_votes = await upsert_house_votes(votes_data)
 
     success_count = 0
     fail_count = 0
@@ -277,7 +281,7 @@ async def processHouseVotes(data):
         # Calculate progress percentage
         progress_pct = (index / total_votes) * 100
 
-        result = await insert_house_vote(vote)
+        result = stored_votes.get((vote.get("congress"), vote.get("rollCallNumber")))
         if result:
             success_count += 1
             # Fetch member votes for this vote - pass the cache
@@ -308,30 +312,57 @@ async def processHouseVotes(data):
     )
 
 
+# Roll calls whose members were fetched (or are being fetched) this run, keyed
+# by (congress, session, rollNumber). Shared by every caller in the process.
+_roll_call_members: dict[tuple[int, int, int], asyncio.Future] = {}
+
+
 async def fetchHouseVoteMembers(vote_obj, congress, session, roll_number, member_cache):
-    url = f"https://api.congress.gov/v3/house-vote/{congress}/{session}/{roll_number}/members"
+    """
+    Fetch and reconcile a roll call's member votes at most once per run.
+    The same roll call is reached from several bills and from fetchHouseVotes;
+    concurrent callers share one in-flight task and later callers get its
+    result. Failed fetches are forgotten so a later caller can retry.
+    """
+    key = (int(congress), int(session), int(roll_number))
+    task = _roll_call_members.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _fetchHouseVoteMembers(vote_obj, congress, session, roll_number, member_cache)
+        )
+        _roll_call_members[key] = task
+
+        def _forget_failure(done):
+            if done.cancelled() or done.exception() is not None or done.result() is None:
+                _roll_call_members.pop(key, None)
+
+        task.add_done_callback(_forget_failure)
+    else:
+        logger.debug(f"house vote {congress}/{session}/{roll_number} already ingested this run")
+    # shield: one caller being cancelled must not cancel the shared fetch
+    return await asyncio.shield(task)
+
+
+async def _fetchHouseVoteMembers(vote_obj, congress, session, roll_number, member_cache):
+    url = f"{API_BASE_URL}/house-vote/{congress}/{session}/{roll_number}/members"
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
-    response = await _request_with_429_retry(
-        url,
-        params,
-        f"fetchHouseVoteMembers {congress}/{session}/{roll_number}",
+    # Every page is needed: insert_member_votes deletes members it doesn't see
+    res = await http_client.get_paginated(
+        url, params, ("houseRollCallVoteMemberVotes", "results"), REQUEST_TIMEOUT
     )
-    if response is None:
+    if res is None:
+        logger.error(f"couldnt fetch member votes for {congress}/{session}/{roll_number}")
         return None
-    if response.status_code == 200:
-        res = response.json()
-        if res:
-            # Pass the member_cache to insert_member_votes
-            result = await insert_member_votes(vote_obj.id, res, member_cache)
-            return result
-    else:
-        print(f"couldnt fetch member votes: {response.status_code}")
-    time.sleep(1)
+    # Pass the member_cache to insert_member_votes
+    return await insert_member_votes(vote_obj.id, res, member_cache, vote=vote_obj)
 
 
 async def main():
     logger.info("connecting to db")
     await connect_db()
+    await load_policy_areas()
+    await load_legislation_index(CONGRESS_NUMBER)
+    await load_latest_actions(CONGRESS_NUMBER)
     logger.info("connected")
     try:
         await fetchLatestBills()
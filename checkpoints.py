@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from insert import prisma
+
+# ── Config ────────────────────────────────────────────────────────────────────
+STAGES = ("details", "actions", "summaries", "cosponsors", "related", "votes")
+FLUSH_EVERY = 100  # Buffered stage results before a write
+FLUSH_INTERVAL = 10  # ...or seconds since the last write, whichever comes first
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    Per-bill, per-stage ingestion progress in the IngestCheckpoint table.
+
+    Completed stages for the congress are loaded once; results are buffered
+    and written in batched upserts, so checkpointing costs a query per
+    FLUSH_EVERY stage results instead of a file append per bill. With
+    `resume=False` nothing counts as done (incremental sync re-runs every
+    stage of a changed bill) but results are still recorded.
+    """
+
+    def __init__(self, congress: int, resume: bool = True):
+        self.congress = congress
+        self.resume = resume
+        self._done: dict[str, set[str]] = {}
+        self._pending: dict[tuple[str, str], dict] = {}
+        self._last_flush = time.monotonic()
+        self._flush_lock = asyncio.Lock()
+
+    async def load(self):
+        rows = await prisma.query_raw(
+            "SELECT nameId, stage FROM ingestcheckpoint WHERE congress = ? AND status = 'done'",
+            self.congress,
+        )
+        for row in rows:
+            self._done.setdefault(row["nameId"], set()).add(row["stage"])
+        logger.info(
+            f"Loaded checkpoints for {len(self._done)} bills in congress {self.congress}"
+        )
+
+    async def load_failures(self) -> dict[str, list[str]]:
+        """Failed stages for the congress, grouped as {stage: [name_id, ...]}."""
+        rows = await prisma.query_raw(
+            "SELECT nameId, stage FROM ingestcheckpoint "
+            "WHERE congress = ? AND status = 'failed' ORDER BY nameId",
+            self.congress,
+        )
+        failures: dict[str, list[str]] = {}
+        for row in rows:
+            failures.setdefault(row["stage"], []).append(row["nameId"])
+        return failures
+
+    async def reset(self):
+        """Forget every checkpoint for the congress (FORCE_REPROCESS)."""
+        deleted = await prisma.ingestcheckpoint.delete_many(
+            where={"congress": self.congress}
+        )
+        self._done.clear()
+        self._pending.clear()
+        logger.info(f"Cleared {deleted} checkpoints for congress {self.congress}")
+
+    def stages_done(self, name_id: str) -> set[str]:
+        if not self.resume:
+            return set()
+        return self._done.get(name_id, set())
+
+    def succeeded(self, name_id: str, stage: str) -> bool:
+        """Whether the stage's last recorded outcome was a success, even without resume."""
+        return stage in self._done.get(name_id, set())
+
+    @property
+    def completed_count(self) -> int:
+        return len(self._done)
+
+    async def record(
+        self,
+        name_id: str,
+        stage: str,
+        ok: bool,
+        error: str | None = None,
+        started_at: datetime | None = None,
+    ):
+        """Buffer one stage result; flushes when the buffer is full or stale."""
+        now = datetime.now(timezone.utc)
+        key = (name_id, stage)
+        entry = self._pending.get(key)
+        attempts = entry["attempts"] + 1 if entry else 1
+        self._pending[key] = {
+            "status": "done" if ok else "failed",
+            "attempts": attempts,
+            "lastError": None if ok else (error or "failed")[:2000],
+            "startedAt": started_at or now,
+            "finishedAt": now,
+        }
+        if ok:
+            self._done.setdefault(name_id, set()).add(stage)
+        else:
+            self._done.get(name_id, set()).discard(stage)
+
+        if (
+            len(self._pending) >= FLUSH_EVERY
+            or time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+        ):
+            await self.flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            try:
+                async with prisma.batch_() as batcher:
+                    for (name_id, stage), entry in pending.items():
+                        batcher.ingestcheckpoint.upsert(
+                            where={"nameId_stage": {"nameId": name_id, "stage": stage}},
+                            data={
+                                "create": {
+                                    "congress": self.congress,
+                                    "nameId": name_id,
+                                    "stage": stage,
+                                    **entry,
+                                },
+                                "update": {
+                                    **entry,
+                                    "attempts": {"increment": entry["attempts"]},
+                                },
+                            },
+                        )
+            except Exception as e:
+                logger.error(f"Failed writing {len(pending)} checkpoints: {e}")
+                # Keep them for the next flush, without losing newer results
+                for key, entry in pending.items():
+                    self._pending.setdefault(key, entry)
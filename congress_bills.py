@@ -1,120 +1,129 @@
+import argparse
 import asyncio
-import requests
 import logging
 import os
+import re
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 from dotenv import load_dotenv
 from variables import VALID_BILL_TYPES
+from checkpoints import STAGES, CheckpointStore
+from leases import LEASE_TTL, Lease, LeaseStore
+from member_index import MemberIndex, member_index
+import http_client
+from http_client import API_BASE_URL
+from rate_limiter import limiter
 from insert import (
     connect_db,
     disconnect_db,
     upsert_bill_details,
     insert_bill_actions,
     insert_bill_summaries,
-    insert_house_vote,
+    upsert_house_votes,
     insert_member_votes,
-    prisma,
+    get_sync_cursor,
+    set_sync_cursor,
+    load_policy_areas,
+    load_legislation_index,
+    load_latest_actions,
+    legislation_snapshot,
+    take_fetched_snapshot,
+    unchanged_stages,
+    save_detail_snapshot,
+    resolve_legislation_id,
+    bill_update_date,
 )
 from bill import (
     fetchBillDetails,
     fetchBillActions,
     fetchBillSummaries,
+    fetchBillCosponsors,
+    fetchBillRelatedBills,
     fetchHouseVoteMembers,
-    insert_house_vote,
 )
 
 load_dotenv()
 
 # ── Config ────────────────────────────────────────────────────────────────────
-TARGET_CONGRESS = 118  # Change this to fetch a different congress
+DEFAULT_CONGRESS = 118  # Used when no congress is given on the command line
 PAGE_SIZE = 250  # Max allowed by the API
-CONCURRENCY = 10  # How many bills to process in parallel
-RATE_LIMIT_SLEEP = (
-    0.1  # Seconds between requests (reduced — concurrency handles pacing)
-)
-RETRY_SLEEP = 60 * 30  # 30 min backoff on 429
+CONCURRENCY = 10  # How many bills to process in parallel (worker pool size)
+QUEUE_PER_WORKER = 4  # Bills buffered per worker between the list producers and workers
+PAGE_FETCH_CONCURRENCY = 4  # Bill list pages fetched/held at once while streaming
+PAGE_RETRIES = 3  # Attempts per bill list page before it is skipped
+PAGE_RETRY_SLEEP = 2  # Base seconds between bill list page retries (pacing is global)
 PROGRESS_EVERY = 25  # Print a progress line every N completed bills
 LOG_DIR = Path("logs")
-COMPLETED_LOG = LOG_DIR / f"completed_bills_{TARGET_CONGRESS}.log"
-FAILED_LOG = LOG_DIR / f"failed_bills_{TARGET_CONGRESS}.log"
+HOUSE_BILL_TYPES = ("HR", "HJRES", "HRES", "HCONRES")  # Bills with a house-votes stage
+# Re-drive: per-stage parallelism, attempts per stage and base backoff (doubles)
+REDRIVE_CONCURRENCY = {
+    "details": 5,
+    "actions": 5,
+    "summaries": 5,
+    "cosponsors": 5,
+    "related": 5,
+    "votes": 3,
+}
+REDRIVE_ATTEMPTS = 4
+REDRIVE_BACKOFF = 5
+# Sharded (--worker) mode: lease batches held at once and idle poll interval
+LEASE_PREFETCH = 2
+LEASE_POLL_INTERVAL = 15
 
 CONGRESS_API_KEY = os.getenv("CONGRESS_API_KEY")
 FORCE_REPROCESS = os.getenv("FORCE_REPROCESS", "false").lower() == "true"
+# Only re-process bills whose updateDate moved past the stored sync cursor
+INCREMENTAL_SYNC = os.getenv("INCREMENTAL_SYNC", "false").lower() == "true"
+# Rebuild from the raw-response archive with no network (pair with FORCE_REPROCESS)
+REPLAY_ARCHIVE = os.getenv("REPLAY_ARCHIVE", "false").lower() == "true"
+# Keep RelatedLegislation in sync (runs only when relatedBills.count changed)
+INGEST_RELATED_BILLS = os.getenv("INGEST_RELATED_BILLS", "true").lower() == "true"
+# Retry only the stages recorded as failed instead of listing the congress
+REDRIVE_FAILED = os.getenv("REDRIVE_FAILED", "false").lower() == "true"
 
 logger = logging.getLogger(__name__)
 
 
-# ── Resume / checkpoint helpers ───────────────────────────────────────────────
-
-
-def _load_completed() -> set[str]:
-    if not COMPLETED_LOG.exists():
-        return set()
-    return set(COMPLETED_LOG.read_text().splitlines())
-
-
-def _mark_completed(name_id: str):
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    with COMPLETED_LOG.open("a") as f:
-        f.write(f"{name_id}\n")
-
-
-def _mark_failed(name_id: str, reason: str):
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    with FAILED_LOG.open("a") as f:
-        f.write(f"{name_id} | {reason}\n")
-
-
-def _initialize_checkpoint_logs(force_reprocess: bool) -> set[str]:
-    """Load completed checkpoints, or reset run state for a full re-import."""
-    if force_reprocess:
-        LOG_DIR.mkdir(parents=True, exist_ok=True)
-        if COMPLETED_LOG.exists():
-            COMPLETED_LOG.unlink()
-        if FAILED_LOG.exists():
-            FAILED_LOG.unlink()
-        logger.info("FORCE_REPROCESS enabled: cleared checkpoint logs for a full rerun")
-        return set()
-
-    return _load_completed()
-
-
 # ── HTTP helper ───────────────────────────────────────────────────────────────
 
 
 async def _get(url: str, params: dict) -> dict | None:
-    """Async GET with polite sleep and 429 backoff."""
-    await asyncio.sleep(RATE_LIMIT_SLEEP)
-    while True:
-        try:
-            response = await asyncio.to_thread(
-                requests.get, url, params=params, timeout=15
-            )
-            if response.status_code == 429:
-                logger.warning(f"Rate limited on {url} — sleeping 30 minutes")
-                await asyncio.sleep(RETRY_SLEEP)
-                continue
-            if response.status_code != 200:
-                logger.error(f"HTTP {response.status_code} for {url}")
-                return None
-            return response.json()
-        except Exception as e:
-            logger.error(f"Request error for {url}: {e}")
+    """Async GET; pacing and 429 backoff are handled by the shared rate limiter."""
+    try:
+        response = await http_client.get(url, params, timeout=15)
+        if response.status_code != 200:
+            logger.error(f"HTTP {response.status_code} for {url}")
             return None
+        return response.json()
+    except Exception as e:
+        logger.error(f"Request error for {url}: {e}")
+        return None
 
 
 # ── Pagination (concurrent page fetching) ────────────────────────────────────
 
 
-async def _fetch_page(base_url: str, offset: int) -> tuple[list[dict], dict] | tuple[None, None]:
-    """Fetch a single page of bills."""
+def _format_api_datetime(value: datetime) -> str:
+    """Congress.gov expects fromDateTime as YYYY-MM-DDTHH:MM:SSZ (UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+async def _fetch_page(
+    base_url: str, offset: int, since: datetime | None = None
+) -> tuple[list[dict], dict] | tuple[None, None]:
+    """Fetch a single page of bills (only those updated after `since`, if given)."""
     params = {
         "api_key": CONGRESS_API_KEY,
         "format": "json",
         "limit": PAGE_SIZE,
         "offset": offset,
     }
+    if since is not None:
+        params["fromDateTime"] = _format_api_datetime(since)
+        params["sort"] = "updateDate asc"  # the client encodes the space
     data = await _get(base_url, params)
     if not data:
         logger.error(f"Failed fetching bill list at offset {offset}")
@@ -122,75 +131,332 @@ async def _fetch_page(base_url: str, offset: int) -> tuple[list[dict], dict] | t
     return data.get("bills", []), data.get("pagination", {})
 
 
-async def fetch_all_bills_for_congress() -> list[dict]:
+async def _fetch_page_with_retry(
+    base_url: str, offset: int, since: datetime | None = None
+) -> tuple[list[dict], dict] | tuple[None, None]:
+    """Fetch one page, retrying a few times before giving up on it."""
+    for attempt in range(1, PAGE_RETRIES + 1):
+        bills, pagination = await _fetch_page(base_url, offset, since)
+        if bills is not None:
+            return bills, pagination
+        if attempt < PAGE_RETRIES:
+            logger.warning(
+                f"Retrying bill list page offset={offset} (attempt {attempt}/{PAGE_RETRIES})"
+            )
+            await asyncio.sleep(PAGE_RETRY_SLEEP * attempt)
+
+    logger.error(f"Skipping unrecoverable page at offset {offset}")
+    return None, None
+
+
+async def fetch_all_bills_for_congress(
+    congress: int,
+    since: datetime | None = None,
+    failed_offsets: list[int] | None = None,
+) -> list[dict]:
     """
-    Fetch all bills for the target congress.
-    Iterates through every page in order so it stays paced and can retry
-    failed pages without stopping the entire import.
+    Fetch all bills for a congress, or only those updated after
+    `since` in incremental mode.
+    The first page tells us `pagination.count`; every remaining offset is then
+    requested concurrently (the shared rate limiter does the pacing) and each
+    page retries on its own. Bills are returned in offset order. Offsets of
+    pages that could not be fetched are appended to `failed_offsets`.
     """
-    base_url = f"https://api.congress.gov/v3/bill/{TARGET_CONGRESS}"
+    base_url = f"{API_BASE_URL}/bill/{congress}"
 
-    all_bills: list[dict] = []
-    offset = 0
-    total = None
+    first_page, pagination = await _fetch_page_with_retry(base_url, 0, since)
+    if first_page is None:
+        if failed_offsets is not None:
+            failed_offsets.append(0)
+        return []
 
-    while True:
-        bills = None
-        pagination = None
+    total = pagination.get("count", 0)
+    logger.info(f"Total bills available: {total}")
 
-        for attempt in range(1, 4):
-            bills, pagination = await _fetch_page(base_url, offset)
-            if bills is not None:
-                break
-            logger.warning(
-                f"Retrying bill list page offset={offset} (attempt {attempt}/3)"
-            )
-            await asyncio.sleep(RATE_LIMIT_SLEEP * attempt)
+    offsets = list(range(PAGE_SIZE, total, PAGE_SIZE))
+    pages = await asyncio.gather(
+        *[_fetch_page_with_retry(base_url, offset, since) for offset in offsets]
+    )
 
+    all_bills: list[dict] = list(first_page)
+    for offset, (bills, _) in zip(offsets, pages):
         if bills is None:
-            logger.error(f"Skipping unrecoverable page at offset {offset}")
-            offset += PAGE_SIZE
-            if total is not None and offset >= total:
-                break
+            if failed_offsets is not None:
+                failed_offsets.append(offset)
             continue
+        all_bills.extend(bills)
 
-        if total is None:
-            total = pagination.get("count", 0)
-            logger.info(f"Total bills available: {total}")
+    logger.info(
+        f"Fetched {len(all_bills)} bills for congress {congress} "
+        f"({len(offsets) + 1} pages)"
+    )
+    return all_bills
 
-        if not bills:
-            if total is None or offset >= total:
-                break
-            offset += PAGE_SIZE
-            continue
 
-        all_bills.extend(bills)
+# ── Per-congress run state ────────────────────────────────────────────────────
+
+
+def new_counters() -> dict:
+    return {
+        "total": 0,
+        "queued": 0,
+        "done": 0,
+        "success": 0,
+        "fail": 0,
+        "skipped": 0,
+        "unchanged": 0,  # Sub-resource stages skipped via the detail snapshot
+    }
+
+
+class CongressRun:
+    """
+    Everything one congress needs during a (possibly multi-congress) run:
+    its checkpoints, progress counters, incremental cursor and failures.
+    Bills of every congress share one queue and worker pool.
+    """
+
+    def __init__(self, congress: int, incremental: bool):
+        self.congress = congress
+        self.incremental = incremental
+        self.since: datetime | None = None
+        # Bills listed by an incremental sync changed since they were last
+        # ingested, so their stages re-run regardless of earlier checkpoints;
+        # the detail snapshot still skips sub-resources whose counts are unchanged
+        self.checkpoints = CheckpointStore(congress, resume=not incremental)
+        self.counters = new_counters()
+        self.failed_offsets: list[int] = []
+        self.failed_update_dates: list[datetime | None] = []
+
+    async def prepare(self, reset: bool = FORCE_REPROCESS):
+        """Load the sync cursor and checkpoints (or reset them)."""
+        if self.incremental:
+            self.since = await get_sync_cursor(self.congress)
+            if self.since:
+                logger.info(
+                    f"Congress {self.congress}: incremental sync — fetching bills "
+                    f"updated since {self.since}"
+                )
+            else:
+                logger.info(
+                    f"Congress {self.congress}: incremental sync — no cursor yet, "
+                    f"listing the full congress"
+                )
+
+        if reset:
+            await self.checkpoints.reset()
+            logger.info(
+                f"Congress {self.congress}: full reprocess — no stages will be "
+                f"skipped from checkpoints"
+            )
+        else:
+            await self.checkpoints.load()
+            logger.info(
+                f"Congress {self.congress}: resuming — "
+                f"{self.checkpoints.completed_count} bills have checkpointed stages"
+            )
+
+    async def finish(self, run_started_at: datetime, advance_cursor: bool = True):
+        """Advance the incremental cursor and log the congress summary."""
+        if self.incremental and advance_cursor:
+            if self.failed_offsets:
+                logger.warning(
+                    f"Congress {self.congress}: {len(self.failed_offsets)} bill list "
+                    f"pages failed — sync cursor not advanced"
+                )
+            else:
+                await _advance_sync_cursor(
+                    self.congress, self.failed_update_dates, run_started_at
+                )
+
         logger.info(
-            f"Fetched page offset={offset} with {len(bills)} bills "
-            f"(running total {len(all_bills)}/{total if total is not None else '?'})"
+            f"Congress {self.congress} complete — "
+            f"{self.counters['success']} succeeded, "
+            f"{self.counters['fail']} failed, "
+            f"{self.counters['skipped']} skipped, "
+            f"{self.counters['unchanged']} unchanged sub-resource fetches avoided"
         )
 
-        offset += PAGE_SIZE
-        if total is not None and offset >= total:
-            break
 
-    logger.info(f"Fetched {len(all_bills)} bills for congress {TARGET_CONGRESS}")
-    return all_bills
+# ── Streaming producer / worker pool ──────────────────────────────────────────
+
+
+async def produce_bills(queue: asyncio.Queue, run: CongressRun):
+    """
+    Stream one congress's bill list items into the shared `queue` as pages
+    arrive, as (run, bill, None) items.
+    Page one is queued immediately so workers start right away. Remaining
+    pages are fetched concurrently, but a page keeps its fetch slot until all
+    of its bills are queued, so at most PAGE_FETCH_CONCURRENCY pages per
+    congress are held in memory no matter how large the congress is.
+    """
+    counters = run.counters
+    since = run.since
+    failed_offsets = run.failed_offsets
+    base_url = f"{API_BASE_URL}/bill/{run.congress}"
+
+    first_page, pagination = await _fetch_page_with_retry(base_url, 0, since)
+    if first_page is None:
+        if failed_offsets is not None:
+            failed_offsets.append(0)
+        return
+
+    total = pagination.get("count", 0)
+    counters["total"] = total
+    logger.info(f"Congress {run.congress}: {total} bills available")
+
+    slots = asyncio.Semaphore(PAGE_FETCH_CONCURRENCY)
+
+    async def enqueue(bills: list[dict]):
+        for bill in bills:
+            await queue.put((run, bill, None))
+            counters["queued"] += 1
+
+    async def fetch_and_enqueue(offset: int):
+        async with slots:
+            bills, _ = await _fetch_page_with_retry(base_url, offset, since)
+            if bills is None:
+                if failed_offsets is not None:
+                    failed_offsets.append(offset)
+                return
+            await enqueue(bills)
+
+    page_tasks = [
+        asyncio.create_task(fetch_and_enqueue(offset))
+        for offset in range(PAGE_SIZE, total, PAGE_SIZE)
+    ]
+    try:
+        await enqueue(first_page)
+        await asyncio.gather(*page_tasks)
+    finally:
+        for task in page_tasks:
+            task.cancel()
+
+    logger.info(f"Queued {counters['queued']} bills for congress {run.congress}")
+
+
+async def bill_worker(queue: asyncio.Queue, member_cache: MemberIndex):
+    """
+    Pull (run, bill, lease) items off the shared queue until cancelled.
+    `lease` is None unless the bill came from a claimed lease batch.
+    """
+    while True:
+        run, bill, lease = await queue.get()
+        try:
+            ok = await process_bill(bill, run.checkpoints, member_cache, run.counters)
+        except Exception as e:
+            # process_bill contains its own errors; this is a last resort
+            logger.error(f"Unexpected worker error for {bill}: {e}", exc_info=True)
+            run.counters["fail"] += 1
+            ok = False
+        finally:
+            queue.task_done()
+            if lease is not None:
+                lease.bill_done(ok)
+
+        if not ok and bill.get("type", "").upper() in VALID_BILL_TYPES:
+            run.failed_update_dates.append(bill_update_date(bill))
+
+
+async def _hold_lease(leases: LeaseStore, lease: Lease):
+    """Renew a lease until all of its bills are processed, then complete it."""
+    while not lease.finished.is_set():
+        try:
+            await asyncio.wait_for(lease.finished.wait(), timeout=LEASE_TTL / 3)
+        except asyncio.TimeoutError:
+            if not await leases.renew(lease):
+                logger.warning(
+                    f"Lease on congress {lease.congress} batch {lease.batch} expired "
+                    f"and may be reprocessed by another worker"
+                )
+    await leases.complete(lease)
+
+
+async def produce_leased_bills(
+    queue: asyncio.Queue, runs: dict[int, CongressRun], leases: LeaseStore
+):
+    """
+    Sharded producer: claim lease batches from the IngestLease table and
+    queue their bills. At most LEASE_PREFETCH batches are held at once. When
+    nothing is claimable, poll until every batch is done, so the batches of
+    a crashed worker are picked up after their lease expires.
+    """
+    congresses = sorted(runs)
+    slots = asyncio.Semaphore(LEASE_PREFETCH)
+    holders: set[asyncio.Task] = set()
+
+    async def hold(lease: Lease):
+        try:
+            await _hold_lease(leases, lease)
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            lease = await leases.claim(congresses)
+            if lease is None:
+                slots.release()
+                if not await leases.outstanding(congresses):
+                    break
+                await asyncio.sleep(LEASE_POLL_INTERVAL)
+                continue
+
+            run = runs[lease.congress]
+            run.counters["total"] += len(lease.bills)
+            holder = asyncio.create_task(hold(lease))
+            holders.add(holder)
+            holder.add_done_callback(holders.discard)
+            for bill in lease.bills:
+                await queue.put((run, bill, lease))
+                run.counters["queued"] += 1
+
+        await asyncio.gather(*holders)
+    finally:
+        for holder in holders:
+            holder.cancel()
 
 
 # ── Per-bill full cycle ───────────────────────────────────────────────────────
 
 
+def required_stages(bill_type: str) -> tuple[str, ...]:
+    skip = set()
+    if bill_type not in HOUSE_BILL_TYPES:
+        skip.add("votes")
+    if not INGEST_RELATED_BILLS:
+        skip.add("related")
+    return tuple(stage for stage in STAGES if stage not in skip)
+
+
+async def _run_stage(checkpoints: CheckpointStore, name_id: str, stage: str, coro):
+    """Await one stage, contain its errors and checkpoint the outcome."""
+    started_at = datetime.now(timezone.utc)
+    try:
+        result = await coro
+        error = None if result else f"{stage} failed"
+    except Exception as e:
+        logger.error(f"{name_id}: {stage} raised exception: {e}")
+        result, error = None, f"{stage} exception: {e}"
+
+    if error:
+        logger.warning(f"{name_id}: {error}, continuing")
+    await checkpoints.record(name_id, stage, error is None, error, started_at)
+    return result
+
+
 async def process_bill(
     bill: dict,
-    completed: set[str],
-    member_cache: dict,
-    semaphore: asyncio.Semaphore,
+    checkpoints: CheckpointStore,
+    member_cache: MemberIndex,
     counters: dict,
 ) -> bool:
     """
-    Full cycle for one bill, guarded by a semaphore to cap concurrency.
+    Full cycle for one bill. Concurrency is capped by the worker pool that
+    calls this. Stages already checkpointed as done are skipped, so a bill
+    whose summaries failed only re-runs summaries on the next run.
     Updates shared `counters` dict for live progress tracking.
+    Returns False if any required stage failed, not just details, so the
+    bill holds back the sync cursor and its lease counts it as failed.
     This function never raises: every error is contained at bill-level.
     """
     congress = bill.get("congress")
@@ -205,110 +471,308 @@ async def process_bill(
         if not all([congress, bill_type, bill_number]):
             logger.warning(f"Skipping bill with missing fields: {bill}")
             counters["fail"] += 1
-            _mark_failed(str(bill), "missing required bill fields")
             return False
 
         if bill_type not in VALID_BILL_TYPES:
+            logger.debug(f"Skipping unsupported bill type: {name_id}")
             counters["skipped"] += 1
-            _mark_failed(name_id, f"unsupported bill type: {bill_type}")
             return False
 
-        if name_id in completed:
+        stages = required_stages(bill_type)
+        done = checkpoints.stages_done(name_id)
+        if all(stage in done for stage in stages):
             logger.debug(f"Skipping already-completed: {name_id}")
             counters["skipped"] += 1
             return True
 
-        async with semaphore:
+        if done:
+            logger.info(f"Processing {name_id} (resuming after {', '.join(sorted(done))})")
+        else:
             logger.info(f"Processing {name_id}")
 
-            # 1. Basic details
-            legislation = await fetchBillDetails(bill)
+        # 1. Basic details
+        legislation_id = None
+        fetched = None
+        unchanged: set[str] = set()
+        if "details" in done:
+            legislation_id = await resolve_legislation_id(name_id)
+        if legislation_id is None:
+            previous = legislation_snapshot(name_id)
+            legislation = await _run_stage(
+                checkpoints, name_id, "details", fetchBillDetails(bill)
+            )
             if not legislation:
-                _mark_failed(name_id, "fetchBillDetails failed")
                 counters["fail"] += 1
                 return False
-
-            # 2. Actions + 3. Summaries — run concurrently, isolate exceptions
-            actions_task = asyncio.create_task(fetchBillActions(bill))
-            summaries_task = asyncio.create_task(fetchBillSummaries(bill))
-            actions_result, summaries_result = await asyncio.gather(
-                actions_task, summaries_task, return_exceptions=True
+            legislation_id = legislation.id
+            fetched = take_fetched_snapshot(name_id)
+
+            # The detail payload carries sub-resource counts and updateDate;
+            # skip stages that are unchanged and were ingested successfully
+            unchanged = {
+                stage
+                for stage in unchanged_stages(previous, fetched)
+                if stage in stages
+                and stage not in done
+                and checkpoints.succeeded(name_id, stage)
+            }
+            if unchanged:
+                logger.debug(f"{name_id}: unchanged, skipping {', '.join(sorted(unchanged))}")
+                counters["unchanged"] += len(unchanged)
+                done = done | unchanged
+
+        # 2. Actions, summaries, cosponsors, related bills — run concurrently, errors contained per stage
+        pending = {}
+        if "actions" not in done:
+            pending["actions"] = _run_stage(
+                checkpoints, name_id, "actions", fetchBillActions(bill, legislation_id)
+            )
+        if "summaries" not in done:
+            pending["summaries"] = _run_stage(
+                checkpoints,
+                name_id,
+                "summaries",
+                fetchBillSummaries(bill, legislation_id),
+            )
+        if "cosponsors" not in done:
+            pending["cosponsors"] = _run_stage(
+                checkpoints,
+                name_id,
+                "cosponsors",
+                fetchBillCosponsors(bill, legislation_id),
+            )
+        if "related" in stages and "related" not in done:
+            pending["related"] = _run_stage(
+                checkpoints,
+                name_id,
+                "related",
+                fetchBillRelatedBills(
+                    bill, legislation_id, (fetched or {}).get("relatedBillsCount")
+                ),
+            )
+        results = await asyncio.gather(*pending.values())
+        succeeded = {stage for stage, result in zip(pending, results) if result}
+
+        # 4. House votes
+        if "votes" in stages and "votes" not in done:
+            if await _run_stage(
+                checkpoints,
+                name_id,
+                "votes",
+                process_house_votes_for_bill(bill, member_cache),
+            ):
+                succeeded.add("votes")
+
+        # 5. Only now record the counts the stages above actually ingested
+        if fetched is not None:
+            await save_detail_snapshot(
+                legislation_id, name_id, fetched, succeeded | unchanged, stages
             )
 
-            if isinstance(actions_result, Exception):
-                logger.error(f"{name_id}: actions raised exception: {actions_result}")
-                _mark_failed(name_id, f"actions exception: {actions_result}")
-            elif not actions_result:
-                logger.warning(f"{name_id}: actions failed, continuing")
-                _mark_failed(name_id, "actions failed")
-
-            if isinstance(summaries_result, Exception):
-                logger.error(f"{name_id}: summaries raised exception: {summaries_result}")
-                _mark_failed(name_id, f"summaries exception: {summaries_result}")
-            elif not summaries_result:
-                logger.warning(f"{name_id}: summaries failed, continuing")
-                _mark_failed(name_id, "summaries failed")
-
-            # 4. House votes
-            if bill_type in ("HR", "HJRES", "HRES", "HCONRES"):
-                try:
-                    await process_house_votes_for_bill(bill, member_cache)
-                except Exception as e:
-                    logger.error(f"{name_id}: house votes failed: {e}")
-                    _mark_failed(name_id, f"house votes failed: {e}")
-
-            _mark_completed(name_id)
-            completed.add(name_id)
-            counters["success"] += 1
-            return True
+        # A bill is only done when every required stage is: otherwise it must
+        # hold back the sync cursor and be listed again next run
+        failed = [
+            stage for stage in stages if stage not in done | succeeded | {"details"}
+        ]
+        if failed:
+            logger.warning(f"{name_id}: incomplete, failed {', '.join(failed)}")
+            counters["fail"] += 1
+            return False
+
+        counters["success"] += 1
+        return True
 
     except Exception as e:
         logger.error(f"Error processing {name_id or bill}: {e}", exc_info=True)
-        _mark_failed(name_id or str(bill), str(e))
         counters["fail"] += 1
         return False
     finally:
         counters["done"] += 1
 
 
-async def process_house_votes_for_bill(bill: dict, member_cache: dict):
+async def process_house_votes_for_bill(bill: dict, member_cache: MemberIndex) -> bool:
+    """Upsert a bill's house roll calls and their member votes; True on success."""
     congress = bill.get("congress")
     bill_type = bill.get("type", "").upper()
     bill_number = bill.get("number")
 
-    url = f"https://api.congress.gov/v3/bill/{congress}/{bill_type}/{bill_number}/house-votes"
+    url = f"{API_BASE_URL}/bill/{congress}/{bill_type}/{bill_number}/house-votes"
     params = {"api_key": CONGRESS_API_KEY, "format": "json"}
 
-    data = await _get(url, params)
+    data = await http_client.get_paginated(
+        url, params, ("houseRollCallVotes",), 15, bill_update_date(bill)
+    )
     if not data:
-        return
+        return False
 
     votes = data.get("houseRollCallVotes", [])
     if not votes:
-        return
+        return True
+
+    stored_votes = await upsert_house_votes(votes)
 
-    # Process all votes for this bill concurrently
-    async def handle_vote(vote):
-        vote_obj = await insert_house_vote(vote)
+    # Fetch member votes for this bill's roll calls concurrently
+    async def handle_vote(vote) -> bool:
+        vote_obj = stored_votes.get((vote.get("congress"), vote.get("rollCallNumber")))
         if not vote_obj:
-            return
+            return False
         roll_number = vote.get("rollCallNumber")
         session = vote.get("sessionNumber")
         if congress and session and roll_number:
-            await fetchHouseVoteMembers(
+            result = await fetchHouseVoteMembers(
                 vote_obj, congress, session, roll_number, member_cache
             )
+            return result is not None
+        return True
+
+    results = await asyncio.gather(*[handle_vote(v) for v in votes])
+    return all(results)
+
+
+# ── Incremental sync cursor ───────────────────────────────────────────────────
+
+
+async def _advance_sync_cursor(
+    congress: int, failed_dates: list[datetime | None], run_started_at: datetime
+):
+    """
+    Move the cursor to the start of this run. If some bills failed, stop at
+    the oldest failed updateDate instead so they are listed again next time.
+    """
+    if not failed_dates:
+        new_cursor = run_started_at
+    elif any(d is None for d in failed_dates):
+        logger.warning(
+            f"Congress {congress}: failed bills without updateDate — sync cursor not advanced"
+        )
+        return
+    else:
+        new_cursor = min(min(failed_dates), run_started_at)
+        logger.info(
+            f"Congress {congress}: {len(failed_dates)} bills failed — "
+            f"holding sync cursor at {new_cursor}"
+        )
+    await set_sync_cursor(congress, new_cursor)
+
 
-    await asyncio.gather(*[handle_vote(v) for v in votes])
+# ── Re-drive of failed stages ─────────────────────────────────────────────────
+
+_NAME_ID_RE = re.compile(r"^(\d+)([A-Z]+)(\d+)$")
+
+
+def bill_from_name_id(name_id: str) -> dict | None:
+    """Rebuild the minimal bill dict the fetchers need from e.g. '118HR1234'."""
+    match = _NAME_ID_RE.match(name_id)
+    if not match:
+        return None
+    congress, bill_type, number = match.groups()
+    return {"congress": int(congress), "type": bill_type, "number": number}
+
+
+async def _redrive_stage(
+    checkpoints: CheckpointStore, name_id: str, stage: str, member_cache: MemberIndex
+) -> bool:
+    """Retry one failed stage with exponential backoff; True once it succeeds."""
+    bill = bill_from_name_id(name_id)
+    if bill is None:
+        logger.error(f"Cannot re-drive {name_id}: unrecognised name_id")
+        return False
+
+    for attempt in range(1, REDRIVE_ATTEMPTS + 1):
+        if stage == "details":
+            coro = fetchBillDetails(bill)
+        else:
+            legislation_id = await resolve_legislation_id(name_id)
+            if legislation_id is None:
+                logger.error(f"Cannot re-drive {name_id} {stage}: legislation missing")
+                return False
+            if stage == "actions":
+                coro = fetchBillActions(bill, legislation_id)
+            elif stage == "summaries":
+                coro = fetchBillSummaries(bill, legislation_id)
+            elif stage == "cosponsors":
+                coro = fetchBillCosponsors(bill, legislation_id)
+            elif stage == "related":
+                coro = fetchBillRelatedBills(bill, legislation_id)
+            else:
+                coro = process_house_votes_for_bill(bill, member_cache)
+
+        if await _run_stage(checkpoints, name_id, stage, coro):
+            return True
+        if attempt < REDRIVE_ATTEMPTS:
+            delay = REDRIVE_BACKOFF * 2 ** (attempt - 1)
+            logger.info(
+                f"{name_id}: {stage} attempt {attempt}/{REDRIVE_ATTEMPTS} failed, "
+                f"retrying in {delay}s"
+            )
+            await asyncio.sleep(delay)
+    return False
+
+
+async def redrive_failures(checkpoints: CheckpointStore, member_cache: MemberIndex) -> dict:
+    """
+    Re-run only the stages recorded as failed, each stage group with its own
+    concurrency. A bill whose details failed never ran its other stages, so
+    once details succeed the rest of the bill runs through process_bill.
+    Returns {stage: [name_id, ...]} of what is still broken, read back from
+    the checkpoints so stages that first ran during the re-drive count too.
+    """
+    failures = await checkpoints.load_failures()
+    if not failures:
+        logger.info(f"No failed stages recorded for congress {checkpoints.congress}")
+        return {}
+    logger.info(
+        "Re-driving failed stages: "
+        + ", ".join(f"{stage}={len(ids)}" for stage, ids in sorted(failures.items()))
+    )
+
+    counters = new_counters()
+
+    async def run_group(stage: str, name_ids: list[str]):
+        semaphore = asyncio.Semaphore(REDRIVE_CONCURRENCY.get(stage, 3))
+
+        async def run_one(name_id: str) -> bool:
+            async with semaphore:
+                ok = await _redrive_stage(checkpoints, name_id, stage, member_cache)
+                if ok and stage == "details":
+                    await process_bill(
+                        bill_from_name_id(name_id), checkpoints, member_cache, counters
+                    )
+                return ok
+
+        results = await asyncio.gather(*[run_one(name_id) for name_id in name_ids])
+        fixed = sum(results)
+        logger.info(f"Re-drive {stage}: {fixed}/{len(name_ids)} fixed")
+
+    await asyncio.gather(
+        *[run_group(stage, name_ids) for stage, name_ids in failures.items()]
+    )
+    await checkpoints.flush()
+    return await checkpoints.load_failures()
 
 
 # ── Progress reporter ─────────────────────────────────────────────────────────
 
 
-async def progress_reporter(counters: dict, total: int, stop_event: asyncio.Event):
+def _sum_counters(runs: list[CongressRun]) -> dict:
+    totals = new_counters()
+    for run in runs:
+        for key, value in run.counters.items():
+            totals[key] += value
+    for run in runs:
+        # A congress whose list hasn't arrived yet counts what it queued so far
+        if not run.counters["total"]:
+            totals["total"] += run.counters["queued"]
+    return totals
+
+
+async def progress_reporter(runs: list[CongressRun], stop_event: asyncio.Event):
     """
-    Prints a progress bar + ETA every PROGRESS_EVERY completed bills,
-    and also on a fixed time interval so the terminal never goes silent.
+    Prints a progress bar + ETA across all congresses on a fixed interval,
+    plus one line per congress still in progress when there are several,
+    so the terminal never goes silent.
+    The total comes from the streaming producers: each list's pagination
+    count once page one arrives, or the number queued so far before that.
     """
     start_time = time.monotonic()
     last_done = 0
@@ -316,7 +780,9 @@ async def progress_reporter(counters: dict, total: int, stop_event: asyncio.Even
     while not stop_event.is_set():
         await asyncio.sleep(15)  # check every 15 seconds
 
+        counters = _sum_counters(runs)
         done = counters["done"]
+        total = counters["total"]
         success = counters["success"]
         fail = counters["fail"]
         skipped = counters["skipped"]
@@ -325,7 +791,7 @@ async def progress_reporter(counters: dict, total: int, stop_event: asyncio.Even
             # Still alive — print a heartbeat anyway
             elapsed = time.monotonic() - start_time
             logger.info(
-                f"[heartbeat] {done}/{total} processed | "
+                f"[heartbeat] {done}/{total} processed ({counters['queued']} queued) | "
                 f"✓ {success}  ✗ {fail}  ~ {skipped} skipped | "
                 f"elapsed {elapsed / 60:.1f}m"
             )
@@ -347,14 +813,24 @@ async def progress_reporter(counters: dict, total: int, stop_event: asyncio.Even
             f"{rate * 60:.1f} bills/min | "
             f"ETA ~{remaining / 60:.1f}m"
         )
+        if len(runs) > 1:
+            for run in runs:
+                c = run.counters
+                run_total = c["total"] or c["queued"]
+                if run_total and c["done"] >= run_total:
+                    continue
+                logger.info(
+                    f"    congress {run.congress}: {c['done']}/{run_total} | "
+                    f"✓ {c['success']}  ✗ {c['fail']}  ~ {c['skipped']}"
+                )
 
 
 # ── Logger setup ──────────────────────────────────────────────────────────────
 
 
-def setup_logger():
+def setup_logger(label: str):
     LOG_DIR.mkdir(parents=True, exist_ok=True)
-    log_file = LOG_DIR / f"congress_bills_{TARGET_CONGRESS}.log"
+    log_file = LOG_DIR / f"congress_bills_{label}.log"
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s - %(levelname)s - %(message)s",
@@ -365,77 +841,340 @@ def setup_logger():
     )
 
 
-# ── Entry point ───────────────────────────────────────────────────────────────
+def _congress_label(congresses: list[int]) -> str:
+    if len(congresses) == 1:
+        return str(congresses[0])
+    return f"{min(congresses)}-{max(congresses)}"
 
 
-async def main():
-    setup_logger()
-    logger.info(
-        f"Starting congress {TARGET_CONGRESS} bill import (concurrency={CONCURRENCY})"
-    )
+async def _preload(congresses: list[int]):
+    """Per-process lookups shared by every congress in the run."""
+    await load_policy_areas()
+    for congress in congresses:
+        await load_legislation_index(congress)
+        await load_latest_actions(congress)
+    await member_index.load()
 
-    await connect_db()
 
-    logger.info("Loading congress member cache...")
-    all_members = await prisma.congressmember.find_many()
-    member_cache = {cm.bioguideId: cm for cm in all_members}
-    logger.info(f"Loaded {len(member_cache)} members into cache")
+async def _run_pool(runs: list[CongressRun], concurrency: int, produce):
+    """
+    Run a fixed worker pool against one shared queue until `produce(queue)`
+    has queued everything and every queued bill is processed.
+    """
+    stop_event = asyncio.Event()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * QUEUE_PER_WORKER)
 
-    completed = _initialize_checkpoint_logs(FORCE_REPROCESS)
-    if FORCE_REPROCESS:
-        logger.info("Running in full reprocess mode — no bills will be skipped from checkpoint logs")
-    else:
-        logger.info(f"Resuming — {len(completed)} bills already completed")
+    # Start the background progress reporter
+    reporter = asyncio.create_task(progress_reporter(runs, stop_event))
 
+    workers = [
+        asyncio.create_task(bill_worker(queue, member_index))
+        for _ in range(concurrency)
+    ]
     try:
-        bills = await fetch_all_bills_for_congress()
+        await produce(queue)
+        await queue.join()
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        stop_event.set()
+        await reporter
+
 
-        # Process every fetched bill so progress reflects full footprint.
+def _log_totals(runs: list[CongressRun], label: str):
+    if len(runs) > 1:
+        totals = _sum_counters(runs)
         logger.info(
-            f"{len(bills)} bills fetched for processing "
-            f"(type filtering and prior completion handled per-bill)"
+            f"All congresses ({label}) complete — "
+            f"{totals['success']} succeeded, "
+            f"{totals['fail']} failed, "
+            f"{totals['skipped']} skipped"
         )
 
-        semaphore = asyncio.Semaphore(CONCURRENCY)
-        counters = {"done": 0, "success": 0, "fail": 0, "skipped": 0}
-        stop_event = asyncio.Event()
 
-        # Start the background progress reporter
-        reporter = asyncio.create_task(
-            progress_reporter(counters, len(bills), stop_event)
+# ── Entry point ───────────────────────────────────────────────────────────────
+
+
+async def main(
+    congresses: list[int], concurrency: int = CONCURRENCY
+) -> list[CongressRun]:
+    """
+    Import every congress in `congresses` with one worker pool.
+    Each congress streams its bill list into the shared queue; the global
+    rate limiter is the single request budget for all of them. Checkpoints,
+    the incremental cursor and progress are kept per congress.
+    """
+    label = _congress_label(congresses)
+    setup_logger(label)
+    logger.info(f"Starting congress {label} bill import (concurrency={concurrency})")
+
+    if REPLAY_ARCHIVE:
+        http_client.enable_replay()
+
+    await connect_db()
+    await _preload(congresses)
+
+    run_started_at = datetime.now(timezone.utc)
+    incremental = INCREMENTAL_SYNC and not REPLAY_ARCHIVE
+    if INCREMENTAL_SYNC and REPLAY_ARCHIVE:
+        logger.warning("INCREMENTAL_SYNC is ignored while replaying the archive")
+
+    runs = [CongressRun(congress, incremental) for congress in congresses]
+    try:
+        for run in runs:
+            await run.prepare()
+
+        # Fixed worker pool; bills of every congress stream in from the producers
+        await _run_pool(
+            runs,
+            concurrency,
+            lambda queue: asyncio.gather(*[produce_bills(queue, run) for run in runs]),
         )
 
-        # Fire all bill tasks concurrently (semaphore caps parallelism)
-        tasks = [
-            process_bill(bill, completed, member_cache, semaphore, counters)
-            for bill in bills
-        ]
-        task_results = await asyncio.gather(*tasks, return_exceptions=True)
+        for run in runs:
+            await run.finish(run_started_at)
+        _log_totals(runs, label)
+
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+    finally:
+        for run in runs:
+            await run.checkpoints.flush()
+        await disconnect_db()
+    return runs
+
+
+async def redrive(congresses: list[int]):
+    """Entry point for --redrive: retry recorded failures, then report."""
+    label = _congress_label(congresses)
+    setup_logger(label)
+    logger.info(f"Re-driving failed stages for congress {label}")
+
+    await connect_db()
+    stores = [CheckpointStore(congress) for congress in congresses]
+    try:
+        await _preload(congresses)
+        for checkpoints in stores:
+            await checkpoints.load()
 
-        unhandled_task_errors = sum(
-            1 for r in task_results if isinstance(r, Exception)
+        results = await asyncio.gather(
+            *[redrive_failures(checkpoints, member_index) for checkpoints in stores]
         )
-        if unhandled_task_errors:
-            counters["fail"] += unhandled_task_errors
-            logger.error(
-                f"Encountered {unhandled_task_errors} unexpected task-level exceptions"
-            )
+        for checkpoints, still_broken in zip(stores, results):
+            if not still_broken:
+                logger.info(
+                    f"Congress {checkpoints.congress}: re-drive complete — nothing left broken"
+                )
+            for stage, name_ids in sorted(still_broken.items()):
+                preview = ", ".join(name_ids[:20])
+                more = f" (+{len(name_ids) - 20} more)" if len(name_ids) > 20 else ""
+                logger.warning(
+                    f"Congress {checkpoints.congress}: still failing {stage}: "
+                    f"{len(name_ids)} bills — {preview}{more}"
+                )
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+    finally:
+        for checkpoints in stores:
+            await checkpoints.flush()
+        await disconnect_db()
 
-        stop_event.set()
-        await reporter
 
-        logger.info(
-            f"Congress {TARGET_CONGRESS} complete — "
-            f"{counters['success']} succeeded, "
-            f"{counters['fail']} failed, "
-            f"{counters['skipped']} skipped"
+# ── Sharded mode (--seed / --worker / --status) ───────────────────────────────
+
+
+async def seed(congresses: list[int]):
+    """
+    Coordinator step: list each congress once and split its bills into lease
+    batches for --worker processes. Re-seeding a congress replaces its batches.
+    With INCREMENTAL_SYNC only bills updated since the cursor are listed, and
+    the cursor moves to the seed time once the whole list was fetched; bills
+    that later fail are left to their checkpoints and --redrive.
+    """
+    label = _congress_label(congresses)
+    setup_logger(label)
+    logger.info(f"Seeding lease batches for congress {label}")
+
+    await connect_db()
+    leases = LeaseStore()
+    try:
+        for congress in congresses:
+            seeded_at = datetime.now(timezone.utc)
+            since = await get_sync_cursor(congress) if INCREMENTAL_SYNC else None
+            if FORCE_REPROCESS:
+                await CheckpointStore(congress).reset()
+
+            failed_offsets: list[int] = []
+            bills = await fetch_all_bills_for_congress(congress, since, failed_offsets)
+            bills = [b for b in bills if b.get("type", "").upper() in VALID_BILL_TYPES]
+            await leases.seed(congress, bills)
+
+            if failed_offsets:
+                logger.warning(
+                    f"Congress {congress}: {len(failed_offsets)} bill list pages failed — "
+                    f"those bills are not in any batch; seed again to include them"
+                )
+            elif INCREMENTAL_SYNC:
+                await set_sync_cursor(congress, seeded_at)
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+    finally:
+        await disconnect_db()
+
+
+async def work(congresses: list[int], concurrency: int = CONCURRENCY):
+    """
+    One of N cooperating workers, on this host or any other: claim lease
+    batches for `congresses` and process their bills until none are left.
+    Workers that share an API key must each be started with
+    CONGRESS_API_WORKERS=N so they split its hourly quota instead of each
+    spending all of it.
+    """
+    label = _congress_label(congresses)
+    setup_logger(label)
+    leases = LeaseStore()
+    logger.info(
+        f"Worker {leases.owner} starting on congress {label} (concurrency={concurrency}, "
+        f"{limiter.rate * 3600:.0f} requests/hour = 1/{limiter.workers} of the API quota)"
+    )
+
+    if REPLAY_ARCHIVE:
+        http_client.enable_replay()
+
+    await connect_db()
+    await _preload(congresses)
+
+    run_started_at = datetime.now(timezone.utc)
+    runs = [
+        CongressRun(congress, INCREMENTAL_SYNC and not REPLAY_ARCHIVE)
+        for congress in congresses
+    ]
+    try:
+        for run in runs:
+            # The seeder owns FORCE_REPROCESS resets and the sync cursor
+            await run.prepare(reset=False)
+
+        runs_by_congress = {run.congress: run for run in runs}
+        await _run_pool(
+            runs,
+            concurrency,
+            lambda queue: produce_leased_bills(queue, runs_by_congress, leases),
         )
 
+        for run in runs:
+            await run.finish(run_started_at, advance_cursor=False)
+        _log_totals(runs, label)
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
+    finally:
+        for run in runs:
+            await run.checkpoints.flush()
+        await disconnect_db()
+
+
+async def show_status(congresses: list[int]):
+    """Coordinator view: aggregate lease progress and live workers."""
+    await connect_db()
+    try:
+        status = await LeaseStore().status(congresses)
     finally:
         await disconnect_db()
 
+    if not status["congresses"]:
+        print(f"No lease batches for congress {_congress_label(congresses)}; run --seed first")
+        return
+
+    print(
+        f"{'congress':>8}  {'batches':>7}  {'done':>6}  {'leased':>6}  {'pending':>7}  "
+        f"{'expired':>7}  {'stuck':>5}  {'bills':>7}  {'ok':>7}  {'failed':>6}  {'pct':>6}"
+    )
+    for congress, entry in sorted(status["congresses"].items()):
+        pct = entry["done"] / entry["batches"] * 100 if entry["batches"] else 0
+        print(
+            f"{congress:>8}  {entry['batches']:>7}  {entry['done']:>6}  {entry['leased']:>6}  "
+            f"{entry['pending']:>7}  {entry['expired']:>7}  {entry['exhausted']:>5}  "
+            f"{entry['bills']:>7}  {entry['billsDone']:>7}  {entry['billsFailed']:>6}  "
+            f"{pct:>5.1f}%"
+        )
+
+    workers = status["workers"]
+    print(f"\n{len(workers)} workers holding live leases")
+    for row in workers:
+        print(
+            f"  {row['owner']}: {row['batches']} batches, {int(row['bills'] or 0)} bills, "
+            f"next expiry {row['nextExpiry']}"
+        )
+
+
+def _congress_arg(value: str) -> list[int]:
+    """'118' or an inclusive range like '110-119'."""
+    try:
+        if "-" in value:
+            start, end = (int(part) for part in value.split("-", 1))
+            if start > end:
+                raise ValueError
+            return list(range(start, end + 1))
+        return [int(value)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected a congress number or range like 110-119, got {value!r}"
+        )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Import Congress.gov bills for one or more congresses."
+    )
+    parser.add_argument(
+        "congresses",
+        nargs="*",
+        type=_congress_arg,
+        help=f"congress numbers or ranges, e.g. 118 or 110-119 (default {DEFAULT_CONGRESS})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=CONCURRENCY,
+        help=f"bills processed in parallel across all congresses (default {CONCURRENCY})",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--redrive",
+        action="store_true",
+        default=REDRIVE_FAILED,
+        help="retry only the stages recorded as failed (same as REDRIVE_FAILED=true)",
+    )
+    mode.add_argument(
+        "--seed",
+        action="store_true",
+        help="sharded mode: list the congresses and create lease batches for workers",
+    )
+    mode.add_argument(
+        "--worker",
+        action="store_true",
+        help="sharded mode: claim and process lease batches until none are left",
+    )
+    mode.add_argument(
+        "--status",
+        action="store_true",
+        help="sharded mode: show aggregate progress of the lease batches",
+    )
+    args = parser.parse_args(argv)
+    congresses = sorted({c for group in args.congresses for c in group})
+    args.congresses = congresses or [DEFAULT_CONGRESS]
+    return args
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.status:
+        asyncio.run(show_status(args.congresses))
+    elif args.seed:
+        asyncio.run(seed(args.congresses))
+    elif args.worker:
+        asyncio.run(work(args.congresses, args.concurrency))
+    elif args.redrive:
+        asyncio.run(redrive(args.congresses))
+    else:
+        asyncio.run(main(args.congresses, args.concurrency))
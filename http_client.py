@@ -0,0 +1,292 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from urllib.parse import parse_qsl, urlparse
+import aiohttp
+from rate_limiter import limiter
+from response_archive import ARCHIVE_ENABLED, archive
+from response_cache import CACHE_ENABLED, cache, cache_key, ttl_for
+
+# ── Config ────────────────────────────────────────────────────────────────────
+# Point at another server (e.g. the bench/ fake API); keep the /v3 path prefix
+API_BASE_URL = os.getenv("CONGRESS_API_BASE_URL", "https://api.congress.gov/v3").rstrip("/")
+REQUEST_TIMEOUT = 20  # Seconds, per request
+MAX_CONNECTIONS = 100  # Total pooled connections across all hosts
+MAX_CONNECTIONS_PER_HOST = 20  # Cap on open sockets to api.congress.gov
+KEEPALIVE_TIMEOUT = 30  # Seconds an idle pooled connection is kept open
+PAGE_LIMIT = 250  # Largest page size Congress.gov list endpoints serve
+
+# Exceptions a caller should treat as "the request failed" (not a bug)
+RequestError = (aiohttp.ClientError, asyncio.TimeoutError)
+
+logger = logging.getLogger(__name__)
+
+_session: aiohttp.ClientSession | None = None
+_replay = False
+
+
+class Response:
+    """
+    A fully-read HTTP response.
+    The body is read before the pooled connection is released, so callers can
+    keep the familiar `status_code` / `json()` / `text` interface without
+    holding a socket.
+    """
+
+    def __init__(self, status_code: int, headers, body: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+# ── Lifecycle ─────────────────────────────────────────────────────────────────
+
+
+def enable_replay():
+    """
+    Serve every GET from the response archive instead of the network.
+    Requests missing from the archive come back as 404s.
+    """
+    global _replay
+    _replay = True
+    archive.open()
+    logger.info("replay mode: responses are read from the archive, no network")
+
+
+async def open_session() -> aiohttp.ClientSession:
+    """Create the shared keep-alive session (idempotent)."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONNECTIONS,
+            limit_per_host=MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            headers={
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+            },
+        )
+        logger.info(
+            f"opened HTTP session (pool={MAX_CONNECTIONS}, per_host={MAX_CONNECTIONS_PER_HOST})"
+        )
+        if CACHE_ENABLED:
+            cache.open()
+        if ARCHIVE_ENABLED:
+            archive.open()
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("closed HTTP session")
+    _session = None
+    cache.close()
+    archive.close()
+
+
+# ── Requests ──────────────────────────────────────────────────────────────────
+
+
+def _clean_params(params: dict | None) -> dict:
+    """aiohttp rejects None values, so drop them (e.g. a missing api_key)."""
+    if not params:
+        return {}
+    return {k: v for k, v in params.items() if v is not None}
+
+
+async def get(
+    url: str,
+    params: dict | None = None,
+    timeout: float = REQUEST_TIMEOUT,
+    changed_since: datetime | None = None,
+) -> Response:
+    """
+    GET through the on-disk response cache, then the shared pooled session.
+
+    A cached body younger than its endpoint TTL is returned without any
+    request. An older one, or one fetched before `changed_since` (e.g. the
+    bill list's updateDate), is revalidated with a conditional request; a
+    304 returns the cached body as a 200.
+    Every body that is not yet in the response archive is appended to it;
+    in replay mode the archive is the only source.
+    Raises one of `RequestError` on network failure or timeout.
+    """
+    key = cache_key(url, params)
+    if _replay:
+        body = archive.read(key)
+        if body is None:
+            return Response(404, {}, b"", url)
+        return Response(200, {}, body, url)
+
+    if not CACHE_ENABLED:
+        response = await _send(url, params, timeout)
+        if response.status_code == 200:
+            _archive(key, url, params, response.body)
+        return response
+
+    entry = cache.lookup(key)
+    changed_at = changed_since.timestamp() if changed_since else None
+    if entry is not None and entry.is_fresh(ttl_for(url), changed_at):
+        cache.hits += 1
+        _archive(key, url, params, entry.body, only_if_missing=True)
+        return Response(200, {}, entry.body, url)
+
+    response = await _send(
+        url, params, timeout, entry.conditional_headers() if entry else None
+    )
+    if response.status_code == 304 and entry is not None:
+        cache.revalidated += 1
+        cache.mark_revalidated(key)
+        _archive(key, url, params, entry.body, only_if_missing=True)
+        return Response(200, response.headers, entry.body, response.url)
+
+    cache.misses += 1
+    if response.status_code == 200:
+        cache.store(key, url, response.body, response.headers)
+        _archive(key, url, params, response.body)
+    return response
+
+
+# ── Pagination ────────────────────────────────────────────────────────────────
+
+
+def _dig(data: dict, path: tuple[str, ...]):
+    for name in path:
+        data = (data or {}).get(name)
+    return data
+
+
+def _next_offset(pagination: dict) -> int | None:
+    """Offset requested by `pagination.next`, if there is a next page."""
+    next_url = (pagination or {}).get("next")
+    if not next_url:
+        return None
+    offset = dict(parse_qsl(urlparse(next_url).query)).get("offset")
+    return int(offset) if offset and offset.isdigit() else None
+
+
+async def _get_page(
+    url: str, params: dict, offset: int, timeout: float, changed_since: datetime | None
+) -> dict | None:
+    try:
+        response = await get(
+            url, {**params, "limit": PAGE_LIMIT, "offset": offset}, timeout, changed_since
+        )
+    except RequestError as e:
+        logger.error(f"request error for {url} at offset {offset}: {e}")
+        return None
+    if response.status_code != 200:
+        logger.error(f"HTTP {response.status_code} for {url} at offset {offset}")
+        return None
+    return response.json()
+
+
+async def get_paginated(
+    url: str,
+    params: dict,
+    items_path: tuple[str, ...],
+    timeout: float = REQUEST_TIMEOUT,
+    changed_since: datetime | None = None,
+) -> dict | None:
+    """
+    Every page of a Congress.gov list endpoint, PAGE_LIMIT items at a time.
+
+    Returns the first page's payload with the items of all pages merged in
+    at `items_path` (e.g. ("actions",) or ("houseRollCallVoteMemberVotes",
+    "results")). Once page one reports `pagination.count` the remaining
+    offsets are fetched concurrently; without a count `pagination.next` is
+    followed page by page. Returns None if any page fails, so a truncated
+    list never reaches an insert that diffs against stored rows.
+    `changed_since` is passed through to get() for every page.
+    """
+    first = await _get_page(url, params, 0, timeout, changed_since)
+    if first is None:
+        return None
+    items = _dig(first, items_path)
+    if not isinstance(items, list):
+        return first
+
+    items = list(items)
+    pagination = first.get("pagination") or {}
+    count = pagination.get("count")
+    if isinstance(count, int):
+        pages = await asyncio.gather(
+            *[
+                _get_page(url, params, offset, timeout, changed_since)
+                for offset in range(PAGE_LIMIT, count, PAGE_LIMIT)
+            ]
+        )
+        for page in pages:
+            if page is None:
+                return None
+            items.extend(_dig(page, items_path) or [])
+    else:
+        offset = _next_offset(pagination)
+        while offset is not None:
+            page = await _get_page(url, params, offset, timeout, changed_since)
+            if page is None:
+                return None
+            items.extend(_dig(page, items_path) or [])
+            offset = _next_offset(page.get("pagination"))
+
+    container = first
+    for name in items_path[:-1]:
+        container = container[name]
+    container[items_path[-1]] = items
+    return first
+
+
+def _archive(key: str, url: str, params: dict | None, body: bytes, only_if_missing=False):
+    if not ARCHIVE_ENABLED:
+        return
+    if only_if_missing and archive.has(key):
+        return
+    archive.append(key, url, params, body)
+
+
+async def _send(
+    url: str, params: dict | None, timeout: float, headers: dict | None = None
+) -> Response:
+    """
+    One network GET, paced by the global rate limiter.
+    A 429 pauses every worker (Retry-After aware) and the request is retried,
+    so callers never see 429s.
+    """
+    session = await open_session()
+    while True:
+        await limiter.acquire()
+        async with session.get(
+            url,
+            params=_clean_params(params),
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            body = await resp.read()
+            response = Response(resp.status, resp.headers, body, str(resp.url))
+
+        if response.status_code == 429:
+            delay = limiter.on_429(response.headers)
+            logger.warning(
+                f"Rate limited on {url} — pausing all requests for {delay / 60:.1f} minutes"
+            )
+            continue
+
+        limiter.on_success(response.headers)
+        return response
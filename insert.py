@@ -1,6 +1,9 @@
 from prisma import Prisma
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
+import hashlib
 import logging
+import http_client
 
 prisma = Prisma()
 logger = logging.getLogger(__name__)
@@ -10,12 +13,14 @@ async def connect_db():
     if not prisma.is_connected():
         await prisma.connect()
         logger.info("connected to DB")
+    await http_client.open_session()
 
 
 async def disconnect_db():
     if prisma.is_connected():
         await prisma.disconnect()
         logger.info("disconnected from DB")
+    await http_client.close_session()
 
 
 def create_name_id(congress: int, bill_type: str, bill_number: str) -> str:
@@ -35,6 +40,324 @@ def parse_date(date_string):
         return None
 
 
+def bill_update_date(bill: dict) -> datetime | None:
+    """
+    A bill-list item's updateDate as an aware datetime. This is the field
+    fromDateTime filters on, and the point after which cached responses for
+    the bill are stale.
+    """
+    raw = bill.get("updateDate")
+    if not raw:
+        return None
+    parsed = parse_date(raw)
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _action_key(action_date: datetime, action_type: str, action_code, text: str) -> str:
+    """Natural key of a BillAction: (date, type, code, text hash)."""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    raw = f"{action_date.strftime('%Y-%m-%d')}|{action_type}|{action_code or ''}|{text_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _utc_iso(value: datetime | None) -> str:
+    """Comparable form of a datetime from either the API (naive) or Prisma (aware)."""
+    if value is None:
+        return ""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _summary_fingerprint(action_date, action_desc, text, update_date) -> str:
+    """Content hash of a BillSummary, used to skip rewriting unchanged rows."""
+    raw = "|".join(
+        [_utc_iso(action_date), action_desc or "", _utc_iso(update_date), text or ""]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def get_sync_cursor(congress: int):
+    """Return the stored bill-list updateDate high-water mark, or None."""
+    cursor = await prisma.synccursor.find_unique(where={"congress": congress})
+    return cursor.lastUpdateDate if cursor else None
+
+
+async def set_sync_cursor(congress: int, last_update_date: datetime):
+    await prisma.synccursor.upsert(
+        where={"congress": congress},
+        data={
+            "create": {"congress": congress, "lastUpdateDate": last_update_date},
+            "update": {"lastUpdateDate": last_update_date},
+        },
+    )
+    logger.info(f"sync cursor for congress {congress} set to {last_update_date}")
+
+
+# ── Policy area dictionary (shared by all workers) ─────────────────────────────
+
+_policy_area_ids: dict[str, int] = {}
+_policy_area_locks: dict[str, asyncio.Lock] = {}
+_policy_areas_load_lock = asyncio.Lock()
+_policy_areas_loaded = False
+
+
+async def load_policy_areas():
+    """Preload the (small) PolicyArea table into the in-memory name -> id map."""
+    global _policy_areas_loaded
+    async with _policy_areas_load_lock:
+        if _policy_areas_loaded:
+            return
+        rows = await prisma.policyarea.find_many(order={"id": "asc"})
+        for row in rows:
+            if row.name:
+                _policy_area_ids.setdefault(row.name, row.id)
+        _policy_areas_loaded = True
+        logger.info(f"Loaded {len(_policy_area_ids)} policy areas")
+
+
+async def resolve_policy_area_id(name: str) -> int:
+    """
+    Map a policy area name to its id without a query in the common case.
+    A miss is created under a per-name lock, so concurrent bills in a new
+    policy area create it once; the unique name makes it safe across processes.
+    """
+    if not _policy_areas_loaded:
+        await load_policy_areas()
+
+    area_id = _policy_area_ids.get(name)
+    if area_id is not None:
+        return area_id
+
+    lock = _policy_area_locks.setdefault(name, asyncio.Lock())
+    async with lock:
+        area_id = _policy_area_ids.get(name)
+        if area_id is None:
+            row = await prisma.policyarea.upsert(
+                where={"name": name},
+                data={"create": {"name": name}, "update": {}},
+            )
+            area_id = row.id
+            _policy_area_ids[name] = area_id
+            logger.info(f"Created policy area {name!r}")
+    return area_id
+
+
+# ── Legislation index (name_id -> id, shared by all workers) ──────────────────
+
+_legislation_ids: dict[str, int] = {}
+# name_id -> stored detail snapshot (source updateDate and sub-resource counts)
+_legislation_snapshots: dict[str, dict] = {}
+# name_id -> snapshot columns of the detail payload just upserted, held until
+# the sub-resource stages have run (see save_detail_snapshot)
+_fetched_snapshots: dict[str, dict] = {}
+
+# Sub-resource stages and the bill-detail count that signals they changed.
+# House votes are recorded as actions, so they follow the actions count.
+SNAPSHOT_COUNTS = {
+    "actions": "actionsCount",
+    "summaries": "summariesCount",
+    "votes": "actionsCount",
+    "cosponsors": "cosponsorsCount",
+    "related": "relatedBillsCount",
+}
+
+
+def _detail_snapshot(columns: dict) -> dict:
+    """Comparable snapshot from Legislation snapshot columns."""
+    source_update_date = columns.get("sourceUpdateDate")
+    return {
+        **{column: columns.get(column) for column in SNAPSHOT_COUNTS.values()},
+        "sourceUpdateDate": _utc_iso(source_update_date) if source_update_date else "",
+    }
+
+
+def _detail_counts(bill_data) -> dict:
+    """Legislation snapshot columns from a bill-detail payload."""
+    return {
+        "sourceUpdateDate": parse_date(bill_data.get("updateDate")),
+        "actionsCount": (bill_data.get("actions") or {}).get("count"),
+        "summariesCount": (bill_data.get("summaries") or {}).get("count"),
+        "cosponsorsCount": (bill_data.get("cosponsors") or {}).get("count"),
+        # The payload omits relatedBills entirely when there are none
+        "relatedBillsCount": (bill_data.get("relatedBills") or {}).get("count") or 0,
+    }
+
+
+async def load_legislation_index(congress: int):
+    """Preload name_id -> id and detail snapshots for one congress in one query."""
+    rows = await prisma.query_raw(
+        "SELECT id, name_id, sourceUpdateDate, actionsCount, summariesCount, "
+        "cosponsorsCount, relatedBillsCount FROM legislation WHERE congress = ?",
+        congress,
+    )
+    for row in rows:
+        name_id = row["name_id"]
+        if not name_id:
+            continue
+        _legislation_ids[name_id] = row["id"]
+        columns = {
+            column: row[column]
+            for column in ("actionsCount", "summariesCount", "cosponsorsCount", "relatedBillsCount")
+        }
+        if row["sourceUpdateDate"]:
+            columns["sourceUpdateDate"] = parse_date(str(row["sourceUpdateDate"]))
+        # Counts are saved per stage, so a snapshot can be partial
+        if any(value is not None for value in columns.values()):
+            _legislation_snapshots[name_id] = _detail_snapshot(columns)
+    logger.info(f"Loaded {len(rows)} legislation ids for congress {congress}")
+
+
+def legislation_snapshot(name_id: str) -> dict | None:
+    """Detail snapshot stored for a bill, or None if it was never recorded."""
+    return _legislation_snapshots.get(name_id)
+
+
+def take_fetched_snapshot(name_id: str) -> dict | None:
+    """Snapshot columns of the detail payload upsert_bill_details just stored."""
+    return _fetched_snapshots.pop(name_id, None)
+
+
+def unchanged_stages(previous: dict | None, fetched: dict | None) -> set[str]:
+    """
+    Sub-resource stages a new detail payload (`fetched`, as returned by
+    take_fetched_snapshot) shows to be unchanged. An identical source
+    updateDate means nothing changed; otherwise a stage is unchanged when
+    its count is the same. Without a previous snapshot nothing can be skipped.
+    """
+    if not previous or not fetched or not fetched["sourceUpdateDate"]:
+        return set()
+    current = _detail_snapshot(fetched)
+    if previous["sourceUpdateDate"] == current["sourceUpdateDate"]:
+        return set(SNAPSHOT_COUNTS)
+    return {
+        stage
+        for stage, column in SNAPSHOT_COUNTS.items()
+        if current[column] is not None and previous[column] == current[column]
+    }
+
+
+async def save_detail_snapshot(
+    legislation_id: int, name_id: str, fetched: dict, settled: set[str], stages
+):
+    """
+    Store the parts of a fetched detail snapshot that this run's stages
+    vouch for. `settled` holds the stages that succeeded or were skipped as
+    unchanged; stages outside `stages` (not run for this bill) don't block.
+    A count is saved once every stage following it has settled, and the
+    source updateDate only once all have, since an equal updateDate skips
+    every stage. An interrupted bill therefore keeps its old snapshot and
+    its unfinished stages run again next time.
+    """
+    settled = settled | (set(SNAPSHOT_COUNTS) - set(stages))
+    columns = {
+        column: fetched[column]
+        for column in set(SNAPSHOT_COUNTS.values())
+        if all(stage in settled for stage, c in SNAPSHOT_COUNTS.items() if c == column)
+    }
+    if settled.issuperset(SNAPSHOT_COUNTS):
+        columns["sourceUpdateDate"] = fetched["sourceUpdateDate"]
+
+    stored = _legislation_snapshots.get(name_id) or _detail_snapshot({})
+    saved = _detail_snapshot(columns)
+    snapshot = {**stored, **{column: saved[column] for column in columns}}
+    if not columns or snapshot == stored:
+        return
+    await prisma.legislation.update(where={"id": legislation_id}, data=columns)
+    _legislation_snapshots[name_id] = snapshot
+
+
+def remember_legislation(name_id: str, legislation_id: int):
+    _legislation_ids[name_id] = legislation_id
+
+
+async def resolve_legislation_id(name_id: str) -> int | None:
+    """Index lookup, falling back to the DB for bills outside the preload."""
+    legislation_id = _legislation_ids.get(name_id)
+    if legislation_id is not None:
+        return legislation_id
+    legislation = await prisma.legislation.find_unique(where={"name_id": name_id})
+    if not legislation:
+        return None
+    remember_legislation(name_id, legislation.id)
+    return legislation.id
+
+
+# ── Latest action ─────────────────────────────────────────────────────────────
+
+# legislation id -> (action date ISO, text hash) of the stored LatestAction
+_latest_actions: dict[int, tuple[str, str]] = {}
+
+
+def _latest_action_state(action_date: datetime | None, text: str | None) -> tuple[str, str]:
+    text_hash = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+    return _utc_iso(action_date), text_hash
+
+
+async def load_latest_actions(congress: int):
+    """Preload the stored LatestAction state for one congress in one query."""
+    rows = await prisma.query_raw(
+        "SELECT la.legislation_id, la.action_date, la.text FROM latestaction la "
+        "JOIN legislation l ON l.id = la.legislation_id WHERE l.congress = ?",
+        congress,
+    )
+    for row in rows:
+        action_date = parse_date(str(row["action_date"])) if row["action_date"] else None
+        _latest_actions[row["legislation_id"]] = _latest_action_state(
+            action_date, row["text"]
+        )
+    logger.info(f"Loaded {len(rows)} latest actions for congress {congress}")
+
+
+async def maintain_latest_action(
+    legislation_id: int,
+    action_date: datetime | None,
+    text: str | None,
+    replace_same_day: bool = True,
+) -> bool:
+    """
+    Upsert a bill's LatestAction only when it advanced: a later date, or
+    (with `replace_same_day`) new text on the same date. Returns True if
+    a write happened.
+    """
+    if action_date is None or not text:
+        return False
+    stored = _latest_actions.get(legislation_id)
+    if stored is None:
+        row = await prisma.latestaction.find_unique(
+            where={"legislation_id": legislation_id}
+        )
+        if row is not None:
+            stored = _latest_action_state(row.action_date, row.text)
+            _latest_actions[legislation_id] = stored
+
+    new_state = _latest_action_state(action_date, text)
+    if stored is not None:
+        if new_state[0] < stored[0]:
+            return False
+        if new_state[0] == stored[0] and (not replace_same_day or new_state[1] == stored[1]):
+            return False
+
+    await prisma.latestaction.upsert(
+        where={"legislation_id": legislation_id},
+        data={
+            "create": {
+                "legislation_id": legislation_id,
+                "action_date": action_date,
+                "text": text,
+            },
+            "update": {"action_date": action_date, "text": text},
+        },
+    )
+    _latest_actions[legislation_id] = new_state
+    return True
+
+
+# ── Bill ingestion ────────────────────────────────────────────────────────────
+
+
 async def upsert_bill_details(bill_data):
     try:
         # required stuff
@@ -50,23 +373,14 @@ async def upsert_bill_details(bill_data):
         bill_type = bill_data.get("type")
         bill_url = bill_data.get("url")
         policy_area_name = (bill_data.get("policyArea") or {}).get("name")
+        detail_counts = _detail_counts(bill_data)
 
         #
         name_id = create_name_id(congress, bill_type, bill_number)
 
         policy_area_id = None
         if policy_area_name:
-            existing_policy_area = await prisma.policyarea.find_first(
-                where={"name": policy_area_name}
-            )
-
-            if existing_policy_area:
-                policy_area_id = existing_policy_area.id
-            else:
-                created_policy_area = await prisma.policyarea.create(
-                    data={"name": policy_area_name}
-                )
-                policy_area_id = created_policy_area.id
+            policy_area_id = await resolve_policy_area_id(policy_area_name)
 
         legislation = await prisma.legislation.upsert(
             where={"name_id": name_id},
@@ -95,6 +409,17 @@ async def upsert_bill_details(bill_data):
             "Update" if legislation.updatedAt > legislation.createdAt else "Created"
         )
         logger.info(f"{action} bill {name_id}")
+        remember_legislation(name_id, legislation.id)
+        if not await sync_legislation_sponsors(legislation.id, bill_data.get("sponsors")):
+            return None
+        latest_action = bill_data.get("latestAction") or {}
+        await maintain_latest_action(
+            legislation.id,
+            parse_date(latest_action["actionDate"]) if latest_action.get("actionDate") else None,
+            latest_action.get("text"),
+        )
+        # Saved by save_detail_snapshot once the sub-resource stages have run
+        _fetched_snapshots[name_id] = detail_counts
         return legislation
     except Exception as e:
         print(f"shit went wrong {e}")
@@ -102,7 +427,11 @@ async def upsert_bill_details(bill_data):
         return None
 
 
-async def insert_bill_actions(bill_data, actions_data):
+async def insert_bill_actions(bill_data, actions_data, legislation_id=None):
+    """
+    Returns the legislation id, or None on failure.
+    Pass `legislation_id` when the caller already has it to skip the lookup.
+    """
     try:
         # required stuff
         congress = bill_data.get("congress")
@@ -112,11 +441,12 @@ async def insert_bill_actions(bill_data, actions_data):
             print("missing args")
             return None
 
-        # Get the legislation record
+        # Get the legislation id
         name_id = create_name_id(congress, bill_type, bill_number)
-        legislation = await prisma.legislation.find_unique(where={"name_id": name_id})
+        if legislation_id is None:
+            legislation_id = await resolve_legislation_id(name_id)
 
-        if not legislation:
+        if not legislation_id:
             print(f"legislation {name_id} not found")
             logger.error(f"Legislation {name_id} not found")
             return None
@@ -126,10 +456,21 @@ async def insert_bill_actions(bill_data, actions_data):
         if not actions:
             print("no actions in response")
             logger.warning("No actions in response")
-            return legislation
+            return legislation_id
+
+        # Keys of every stored action for this bill, in one query. Computed
+        # from the row fields, the same way backfill_action_keys.py keyed
+        # rows written before actionKey existed.
+        existing = await prisma.billaction.find_many(
+            where={"legislationId": legislation_id}
+        )
+        existing_keys = {
+            _action_key(a.actionDate, a.type, a.actionCode, a.text) for a in existing
+        }
 
         success_count = 0
         fail_count = 0
+        new_actions: dict[str, dict] = {}
 
         for action in actions:
             action_date_str = action.get("actionDate")
@@ -146,43 +487,52 @@ async def insert_bill_actions(bill_data, actions_data):
                 fail_count += 1
                 continue
 
-            # Check if exists
-            existing = await prisma.billaction.find_first(
-                where={
-                    "legislationId": legislation.id,
-                    "actionDate": action_date,
-                    "text": action_text,
-                    "type": action_type,
-                }
-            )
-
-            if existing:
+            key = _action_key(action_date, action_type, action_code, action_text)
+            if key in existing_keys or key in new_actions:
                 success_count += 1
                 continue
 
-            # Insert action
-            await prisma.billaction.create(
-                data={
-                    "legislationId": legislation.id,
-                    "actionDate": action_date,
-                    "text": action_text,
-                    "type": action_type,
-                    "actionCode": action_code,
-                }
+            new_actions[key] = {
+                "legislationId": legislation_id,
+                "actionDate": action_date,
+                "text": action_text,
+                "type": action_type,
+                "actionCode": action_code,
+                "actionKey": key,
+            }
+
+        # One insert for everything new; the unique key makes concurrent runs safe
+        if new_actions:
+            await prisma.billaction.create_many(
+                data=list(new_actions.values()), skip_duplicates=True
+            )
+            success_count += len(new_actions)
+
+            # The detail payload's latestAction decides between same-day
+            # actions; here only a later date moves LatestAction forward
+            newest = max(new_actions.values(), key=lambda a: a["actionDate"])
+            await maintain_latest_action(
+                legislation_id,
+                newest["actionDate"],
+                newest["text"],
+                replace_same_day=False,
             )
-            success_count += 1
 
         logger.info(
             f"Bill {name_id}: {success_count} actions processed, {fail_count} failed"
         )
-        return legislation
+        return legislation_id
     except Exception as e:
         print(f"shit went wrong {e}")
         logger.error(f"fatal error in inserting actions: {e}")
         return None
 
 
-async def insert_bill_summaries(bill_data, summaries_data):
+async def insert_bill_summaries(bill_data, summaries_data, legislation_id=None):
+    """
+    Returns the legislation id, or None on failure.
+    Pass `legislation_id` when the caller already has it to skip the lookup.
+    """
     try:
         # required stuff
         congress = bill_data.get("congress")
@@ -194,10 +544,11 @@ async def insert_bill_summaries(bill_data, summaries_data):
 
         name_id = create_name_id(congress, bill_type, bill_number)
 
-        # Get the legislation record
-        legislation = await prisma.legislation.find_unique(where={"name_id": name_id})
+        # Get the legislation id
+        if legislation_id is None:
+            legislation_id = await resolve_legislation_id(name_id)
 
-        if not legislation:
+        if not legislation_id:
             print(f"legislation {name_id} not found")
             logger.error(f"Legislation {name_id} not found")
             return None
@@ -207,10 +558,19 @@ async def insert_bill_summaries(bill_data, summaries_data):
         if not summaries:
             print("no summaries in response")
             logger.warning("No summaries in response")
-            return legislation
+            return legislation_id
+
+        # Every stored summary for this bill in one query, keyed by versionCode
+        existing_rows = await prisma.billsummary.find_many(
+            where={"legislationId": legislation_id}
+        )
+        existing_by_version = {row.versionCode: row for row in existing_rows}
 
         success_count = 0
+        unchanged_count = 0
         fail_count = 0
+        to_update: dict[int, dict] = {}
+        to_create: dict[str, dict] = {}
 
         for summary in summaries:
             action_date_str = summary.get("actionDate")
@@ -226,134 +586,390 @@ async def insert_bill_summaries(bill_data, summaries_data):
             action_date = parse_date(action_date_str) if action_date_str else None
             update_date = parse_date(update_date_str) if update_date_str else None
 
-            # Check if exists
-            existing = await prisma.billsummary.find_first(
-                where={
-                    "legislationId": legislation.id,
-                    "versionCode": version_code,
-                }
-            )
-
+            existing = existing_by_version.get(version_code)
             if existing:
-                # Update existing summary
-                await prisma.billsummary.update(
-                    where={"id": existing.id},
-                    data={
-                        "actionDate": action_date,
-                        "actionDesc": action_desc,
-                        "text": text,
-                        "updateDate": update_date,
-                    },
-                )
-                success_count += 1
-                continue
-
-            # Insert summary
-            await prisma.billsummary.create(
-                data={
-                    "legislationId": legislation.id,
+                if _summary_fingerprint(
+                    existing.actionDate,
+                    existing.actionDesc,
+                    existing.text,
+                    existing.updateDate,
+                ) == _summary_fingerprint(action_date, action_desc, text, update_date):
+                    unchanged_count += 1
+                    success_count += 1
+                    continue
+
+                to_update[existing.id] = {
                     "actionDate": action_date,
                     "actionDesc": action_desc,
                     "text": text,
                     "updateDate": update_date,
-                    "versionCode": version_code,
                 }
-            )
+                success_count += 1
+                continue
+
+            to_create[version_code] = {
+                "legislationId": legislation_id,
+                "actionDate": action_date,
+                "actionDesc": action_desc,
+                "text": text,
+                "updateDate": update_date,
+                "versionCode": version_code,
+            }
             success_count += 1
 
+        # Only changed/new rows are written, all in one transaction
+        if to_update or to_create:
+            async with prisma.batch_() as batcher:
+                for summary_id, data in to_update.items():
+                    batcher.billsummary.update(where={"id": summary_id}, data=data)
+                if to_create:
+                    batcher.billsummary.create_many(data=list(to_create.values()))
+
         logger.info(
-            f"Bill {name_id}: {success_count} summaries processed, {fail_count} failed"
+            f"Bill {name_id}: {success_count} summaries processed "
+            f"({len(to_create)} new, {len(to_update)} updated, {unchanged_count} unchanged), "
+            f"{fail_count} failed"
         )
-        return legislation
+        return legislation_id
     except Exception as e:
         print(f"shit went wrong {e}")
         logger.error(f"fatal error in inserting summaries: {e}")
         return None
 
 
-async def insert_house_vote(vote_data):
+async def _sync_bioguide_links(table: str, column: str, legislation_id: int, wanted: set[str]):
+    """
+    Make the (legislationId, `column`) rows of a sponsor link table match
+    `wanted`: one read, then a single batch of create_many/delete_many.
+    Returns (added, removed).
+    """
+    delegate = getattr(prisma, table)
+    existing_rows = await delegate.find_many(where={"legislationId": legislation_id})
+    existing = {getattr(row, column) for row in existing_rows}
+
+    to_add = sorted(wanted - existing)
+    to_remove = sorted(existing - wanted)
+    if to_add or to_remove:
+        async with prisma.batch_() as batcher:
+            batch_delegate = getattr(batcher, table)
+            if to_add:
+                batch_delegate.create_many(
+                    data=[{"legislationId": legislation_id, column: b} for b in to_add],
+                    skip_duplicates=True,
+                )
+            if to_remove:
+                batch_delegate.delete_many(
+                    where={"legislationId": legislation_id, column: {"in": to_remove}}
+                )
+    return len(to_add), len(to_remove)
+
+
+async def sync_legislation_sponsors(legislation_id: int, sponsors) -> bool:
+    """Sponsors come with the bill-detail payload, so no extra request is needed."""
     try:
-        # required stuff
-        congress = vote_data.get("congress")
-        roll_call_number = vote_data.get("rollCallNumber")
-        session_number = vote_data.get("sessionNumber")
+        wanted = {s.get("bioguideId") for s in sponsors or [] if s.get("bioguideId")}
+        added, removed = await _sync_bioguide_links(
+            "legislationsponsor", "sponsorBioguideId", legislation_id, wanted
+        )
+        if added or removed:
+            logger.info(f"Legislation {legislation_id}: sponsors +{added} -{removed}")
+        return True
+    except Exception as e:
+        logger.error(f"fatal error in syncing sponsors: {e}")
+        return False
+
+
+async def insert_bill_cosponsors(bill_data, cosponsors_data, legislation_id=None):
+    """
+    Returns the legislation id, or None on failure.
+    Withdrawn cosponsors are dropped from LegislationCosponsor.
+    """
+    try:
+        congress = bill_data.get("congress")
+        bill_type = bill_data.get("type")
+        bill_number = bill_data.get("number")
+        if not all([congress, bill_type, bill_number]):
+            logger.error("Bill payload missing congress, type or number; cosponsors not stored")
+            return None
+
+        name_id = create_name_id(congress, bill_type, bill_number)
+        if legislation_id is None:
+            legislation_id = await resolve_legislation_id(name_id)
+
+        if not legislation_id:
+            logger.error(f"Legislation {name_id} not found")
+            return None
+
+        cosponsors = cosponsors_data.get("cosponsors", [])
+        wanted = {
+            c.get("bioguideId")
+            for c in cosponsors
+            if c.get("bioguideId") and not c.get("sponsorshipWithdrawnDate")
+        }
+        added, removed = await _sync_bioguide_links(
+            "legislationcosponsor", "cosponsorBioguideId", legislation_id, wanted
+        )
+        logger.info(
+            f"Bill {name_id}: {len(wanted)} cosponsors, {added} added, {removed} removed"
+        )
+        return legislation_id
+    except Exception as e:
+        logger.error(f"fatal error in inserting cosponsors: {e}")
+        return None
+
 
-        if not all([congress, roll_call_number]):
-            print("missing args for house vote")
+async def insert_bill_related_bills(bill_data, related_data, legislation_id=None):
+    """
+    Returns the legislation id, or None on failure.
+    Makes RelatedLegislation match the payload: new pairs go in through one
+    create_many, changed titles are updated and pairs no longer listed are
+    pruned, all in a single batch.
+    """
+    try:
+        congress = bill_data.get("congress")
+        bill_type = bill_data.get("type")
+        bill_number = bill_data.get("number")
+        if not all([congress, bill_type, bill_number]):
+            logger.error("Bill payload missing congress, type or number; related bills not stored")
             return None
 
-        # get the rest
-        legislation_number = vote_data.get("legislationNumber")
-        legislation_type = vote_data.get("legislationType")
-        result = vote_data.get("result")
-        start_date = parse_date(vote_data.get("startDate"))
-        vote_type = vote_data.get("voteType")
-        vote_question = vote_data.get("voteQuestion")
-
-        # Create name_id for linking to legislation
-        name_id = None
-        if legislation_number and legislation_type:
-            name_id = create_name_id(congress, legislation_type, legislation_number)
-
-        # Find existing vote using find_first
-        existing_vote = await prisma.vote.find_first(
-            where={
-                "congress": congress,
-                "chamber": "HOUSE",  # FIXED: Use correct enum value
-                "rollNumber": roll_call_number,
+        name_id = create_name_id(congress, bill_type, bill_number)
+        if legislation_id is None:
+            legislation_id = await resolve_legislation_id(name_id)
+
+        if not legislation_id:
+            logger.error(f"Legislation {name_id} not found")
+            return None
+
+        # (relatedNameId, relationshipType) -> title; one row per relationship
+        desired: dict[tuple[str, str], str] = {}
+        for related in related_data.get("relatedBills", []):
+            related_congress = related.get("congress")
+            related_type = related.get("type")
+            related_number = related.get("number")
+            if not all([related_congress, related_type, related_number]):
+                continue
+            related_name_id = create_name_id(related_congress, related_type, related_number)
+            for detail in related.get("relationshipDetails") or []:
+                relationship_type = detail.get("type")
+                if relationship_type:
+                    desired[(related_name_id, relationship_type)] = related.get("title") or ""
+
+        existing_rows = await prisma.relatedlegislation.find_many(
+            where={"legislationId": legislation_id}
+        )
+        existing = {(r.relatedNameId, r.relationshipType): r for r in existing_rows}
+
+        to_create = [
+            {
+                "legislationId": legislation_id,
+                "relatedNameId": related_name_id,
+                "relationshipType": relationship_type,
+                "title": title,
             }
+            for (related_name_id, relationship_type), title in desired.items()
+            if (related_name_id, relationship_type) not in existing
+        ]
+        to_update = {
+            row.id: title
+            for key, title in desired.items()
+            if (row := existing.get(key)) is not None and row.title != title
+        }
+        to_delete = [row.id for key, row in existing.items() if key not in desired]
+
+        if to_create or to_update or to_delete:
+            async with prisma.batch_() as batcher:
+                if to_create:
+                    batcher.relatedlegislation.create_many(
+                        data=to_create, skip_duplicates=True
+                    )
+                for row_id, title in to_update.items():
+                    batcher.relatedlegislation.update(
+                        where={"id": row_id}, data={"title": title}
+                    )
+                if to_delete:
+                    batcher.relatedlegislation.delete_many(
+                        where={"id": {"in": to_delete}}
+                    )
+
+        logger.info(
+            f"Bill {name_id}: {len(desired)} related bills, {len(to_create)} added, "
+            f"{len(to_update)} updated, {len(to_delete)} pruned"
         )
+        return legislation_id
+    except Exception as e:
+        logger.error(f"fatal error in inserting related bills: {e}")
+        return None
 
-        if existing_vote:
-            # Update existing vote
-            vote = await prisma.vote.update(
-                where={"id": existing_vote.id},
-                data={
-                    "date": start_date if start_date else datetime.now(),
-                    "description": vote_question,
-                    "question": vote_question,
-                    "result": result,
-                    "billNumber": legislation_number,
-                    "name_id": name_id,
-                },
+
+async def resolve_legislation_ids(name_ids) -> dict[str, int]:
+    """Batch form of resolve_legislation_id: one query for all index misses."""
+    misses = [n for n in set(name_ids) if n not in _legislation_ids]
+    if misses:
+        rows = await prisma.legislation.find_many(where={"name_id": {"in": misses}})
+        for row in rows:
+            remember_legislation(row.name_id, row.id)
+    return {n: _legislation_ids[n] for n in set(name_ids) if n in _legislation_ids}
+
+
+def _house_vote_fields(vote_data) -> dict | None:
+    """Vote columns from a houseRollCallVotes item (without legislationId)."""
+    congress = vote_data.get("congress")
+    roll_call_number = vote_data.get("rollCallNumber")
+    if not all([congress, roll_call_number]):
+        return None
+
+    legislation_number = vote_data.get("legislationNumber")
+    legislation_type = vote_data.get("legislationType")
+    vote_question = vote_data.get("voteQuestion")
+
+    name_id = None
+    if legislation_number and legislation_type:
+        name_id = create_name_id(congress, legislation_type, legislation_number)
+
+    return {
+        "congress": congress,
+        "rollNumber": roll_call_number,
+        "date": parse_date(vote_data.get("startDate")),
+        "description": vote_question,
+        "question": vote_question,
+        "result": vote_data.get("result"),
+        "billNumber": legislation_number,
+        "name_id": name_id,
+    }
+
+
+def _house_vote_changes(existing, fields: dict) -> dict:
+    """Columns of `fields` that differ from the stored Vote row."""
+    changes = {}
+    for column in ("description", "question", "result", "billNumber", "name_id", "legislationId"):
+        if getattr(existing, column) != fields[column]:
+            changes[column] = fields[column]
+    if fields["date"] and _utc_iso(existing.date) != _utc_iso(fields["date"]):
+        changes["date"] = fields["date"]
+    return changes
+
+
+async def upsert_house_votes(votes_data) -> dict[tuple[int, int], object]:
+    """
+    Upsert a page of houseRollCallVotes items in a handful of queries:
+    one IN lookup per congress for existing rows, one batched transaction for
+    all creates and updates, and one read back of the created rows.
+    Returns {(congress, rollNumber): Vote}; unchanged rows are not rewritten.
+    """
+    try:
+        by_key: dict[tuple[int, int], dict] = {}
+        for vote_data in votes_data:
+            fields = _house_vote_fields(vote_data)
+            if not fields:
+                logger.warning(f"House vote missing congress or roll number: {vote_data.get('url')}")
+                continue
+            by_key[(fields["congress"], fields["rollNumber"])] = fields
+
+        if not by_key:
+            return {}
+
+        legislation_ids = await resolve_legislation_ids(
+            f["name_id"] for f in by_key.values() if f["name_id"]
+        )
+        for fields in by_key.values():
+            fields["legislationId"] = legislation_ids.get(fields["name_id"])
+
+        rolls_by_congress: dict[int, list[int]] = {}
+        for congress, roll_number in by_key:
+            rolls_by_congress.setdefault(congress, []).append(roll_number)
+
+        votes: dict[tuple[int, int], object] = {}
+        for congress, roll_numbers in rolls_by_congress.items():
+            existing_rows = await prisma.vote.find_many(
+                where={
+                    "congress": congress,
+                    "chamber": "HOUSE",
+                    "rollNumber": {"in": roll_numbers},
+                }
             )
-            logger.info(f"Updated house vote {congress}/{roll_call_number}")
-        else:
-            # Create new vote
-            vote = await prisma.vote.create(
-                data={
+            for row in existing_rows:
+                votes[(row.congress, row.rollNumber)] = row
+
+        to_create = []
+        to_update = {}
+        for key, fields in by_key.items():
+            existing = votes.get(key)
+            if existing is None:
+                to_create.append(
+                    {
+                        **fields,
+                        "chamber": "HOUSE",
+                        "date": fields["date"] or datetime.now(),
+                        "totalYea": 0,
+                        "totalNay": 0,
+                        "totalNotVoting": 0,
+                        "totalPresent": 0,
+                    }
+                )
+                continue
+            changes = _house_vote_changes(existing, fields)
+            if changes:
+                to_update[existing.id] = changes
+
+        if to_create or to_update:
+            async with prisma.batch_() as batcher:
+                if to_create:
+                    batcher.vote.create_many(data=to_create, skip_duplicates=True)
+                for vote_id, changes in to_update.items():
+                    batcher.vote.update(where={"id": vote_id}, data=changes)
+
+        created_by_congress: dict[int, list[int]] = {}
+        for row in to_create:
+            created_by_congress.setdefault(row["congress"], []).append(row["rollNumber"])
+        for congress, roll_numbers in created_by_congress.items():
+            created_rows = await prisma.vote.find_many(
+                where={
                     "congress": congress,
-                    "chamber": "HOUSE",  # FIXED: Use correct enum value
-                    "rollNumber": roll_call_number,
-                    "date": start_date if start_date else datetime.now(),
-                    "description": vote_question,
-                    "question": vote_question,
-                    "result": result,
-                    "billNumber": legislation_number,
-                    "name_id": name_id,
-                    "totalYea": 0,
-                    "totalNay": 0,
-                    "totalNotVoting": 0,
-                    "totalPresent": 0,
+                    "chamber": "HOUSE",
+                    "rollNumber": {"in": roll_numbers},
                 }
             )
-            logger.info(f"Created house vote {congress}/{roll_call_number}")
+            for row in created_rows:
+                votes[(row.congress, row.rollNumber)] = row
 
-        return vote
+        logger.info(
+            f"House votes: {len(to_create)} created, {len(to_update)} updated, "
+            f"{len(by_key) - len(to_create) - len(to_update)} unchanged"
+        )
+        return votes
     except Exception as e:
-        print(f"shit went wrong {e}")
-        logger.error(f"fatal error in inserting house vote: {e}")
-        return None
+        logger.error(f"fatal error in upserting house votes: {e}")
+        return {}
+
 
+def _vote_position(vote_cast) -> str | None:
+    """Map a Congress.gov voteCast to the VotePosition enum."""
+    if vote_cast in ["Yea", "Aye"]:
+        return "YEA"
+    if vote_cast == "Nay":
+        return "NAY"
+    if vote_cast == "Present":
+        return "PRESENT"
+    if vote_cast == "Not Voting":
+        return "NOT_VOTING"
+    return None
 
-async def insert_member_votes(vote_id, members_data, member_cache=None):
+
+async def insert_member_votes(vote_id, members_data, member_cache=None, vote=None):
     """
-    Optimized version with member caching and batch operations.
+    Reconcile the stored MemberVote rows for a vote with the API payload.
+
+    New members are bulk-inserted, corrected positions (or party/state) are
+    updated and members no longer in the roll call are deleted, all in one
+    transaction. The Vote totals are only written when they changed.
 
     Args:
         vote_id: The vote ID
         members_data: API response data
-        member_cache: Dict mapping bioguideId -> member object (optional)
+        member_cache: A MemberIndex; unknown members are loaded through it
+            instead of being dropped (optional)
+        vote: The stored Vote row, if the caller has it (skips a lookup)
     """
     try:
         # Get the correct nested structure
@@ -365,104 +981,110 @@ async def insert_member_votes(vote_id, members_data, member_cache=None):
             logger.warning("No members in response")
             return None
 
-        # If no cache provided, fetch all members at once
+        all_bioguide_ids = [m.get("bioguideID") for m in members if m.get("bioguideID")]
         if member_cache is None:
-            all_bioguide_ids = [
-                m.get("bioguideID") for m in members if m.get("bioguideID")
-            ]
+            # No index provided: fetch this roll call's members at once
             congress_members = await prisma.congressmember.find_many(
                 where={"bioguideId": {"in": all_bioguide_ids}}
             )
-            member_cache = {cm.bioguideId: cm for cm in congress_members}
-
-        # Get existing member votes for this vote in one query
-        existing_votes = await prisma.membervote.find_many(where={"voteId": vote_id})
-        existing_member_ids = {mv.memberId for mv in existing_votes}
+            known_members = {cm.bioguideId: cm for cm in congress_members}
+        else:
+            known_members = await member_cache.resolve(all_bioguide_ids)
 
-        success_count = 0
         fail_count = 0
+        unresolved_count = 0
+        totals = {"YEA": 0, "NAY": 0, "PRESENT": 0, "NOT_VOTING": 0}
 
-        # Track vote totals
-        total_yea = 0
-        total_nay = 0
-        total_present = 0
-        total_not_voting = 0
-
-        # Batch insert data
-        votes_to_insert = []
+        # memberId -> desired row, from the payload
+        desired: dict[int, dict] = {}
 
         for member in members:
             bioguide_id = member.get("bioguideID")
             vote_cast = member.get("voteCast")
-            vote_party = member.get("voteParty")
-            vote_state = member.get("voteState")
 
             if not all([bioguide_id, vote_cast]):
                 fail_count += 1
                 continue
 
-            # Map vote cast to VotePosition enum
-            vote_position = None
-            if vote_cast in ["Yea", "Aye"]:
-                vote_position = "YEA"
-                total_yea += 1
-            elif vote_cast == "Nay":
-                vote_position = "NAY"
-                total_nay += 1
-            elif vote_cast == "Present":
-                vote_position = "PRESENT"
-                total_present += 1
-            elif vote_cast == "Not Voting":
-                vote_position = "NOT_VOTING"
-                total_not_voting += 1
-            else:
+            vote_position = _vote_position(vote_cast)
+            if not vote_position:
                 fail_count += 1
                 continue
+            totals[vote_position] += 1
 
             # Look up member in cache
-            congress_member = member_cache.get(bioguide_id)
+            congress_member = known_members.get(bioguide_id)
 
             if not congress_member:
                 logger.warning(f"Congress member {bioguide_id} not found")
+                unresolved_count += 1
                 fail_count += 1
                 continue
 
-            # Skip if already exists
-            if congress_member.id in existing_member_ids:
-                success_count += 1
-                continue
-
-            # Add to batch insert
-            votes_to_insert.append(
-                {
-                    "voteId": vote_id,
-                    "memberId": congress_member.id,
-                    "votePosition": vote_position,
-                    "party": vote_party,
-                    "state": vote_state,
-                }
-            )
+            desired[congress_member.id] = {
+                "votePosition": vote_position,
+                "party": member.get("voteParty"),
+                "state": member.get("voteState"),
+            }
 
-        # Batch insert all member votes
-        if votes_to_insert:
-            await prisma.membervote.create_many(data=votes_to_insert)
-            success_count += len(votes_to_insert)
+        # Diff against what is stored (one query)
+        existing_votes = await prisma.membervote.find_many(where={"voteId": vote_id})
+        existing_by_member = {mv.memberId: mv for mv in existing_votes}
+
+        to_insert = []
+        to_update: dict[int, dict] = {}
+        for member_id, row in desired.items():
+            existing = existing_by_member.get(member_id)
+            if existing is None:
+                to_insert.append({"voteId": vote_id, "memberId": member_id, **row})
+                continue
+            changes = {
+                column: value
+                for column, value in row.items()
+                if getattr(existing, column) != value
+            }
+            if changes:
+                to_update[existing.id] = changes
+
+        # A member we could not resolve may own one of the stored rows, so
+        # only prune when every payload member was matched.
+        to_delete = []
+        if unresolved_count == 0:
+            to_delete = [
+                mv.id for member_id, mv in existing_by_member.items()
+                if member_id not in desired
+            ]
 
-        # Update vote totals in the Vote table
-        await prisma.vote.update(
-            where={"id": vote_id},
-            data={
-                "totalYea": total_yea,
-                "totalNay": total_nay,
-                "totalPresent": total_present,
-                "totalNotVoting": total_not_voting,
-                "totalVoting": total_yea + total_nay,
-            },
+        new_totals = {
+            "totalYea": totals["YEA"],
+            "totalNay": totals["NAY"],
+            "totalPresent": totals["PRESENT"],
+            "totalNotVoting": totals["NOT_VOTING"],
+            "totalVoting": totals["YEA"] + totals["NAY"],
+        }
+        if vote is None:
+            vote = await prisma.vote.find_unique(where={"id": vote_id})
+        totals_changed = vote is None or any(
+            getattr(vote, column) != value for column, value in new_totals.items()
         )
 
+        if to_insert or to_update or to_delete or totals_changed:
+            async with prisma.batch_() as batcher:
+                if to_insert:
+                    batcher.membervote.create_many(data=to_insert, skip_duplicates=True)
+                for member_vote_id, changes in to_update.items():
+                    batcher.membervote.update(where={"id": member_vote_id}, data=changes)
+                if to_delete:
+                    batcher.membervote.delete_many(where={"id": {"in": to_delete}})
+                if totals_changed:
+                    batcher.vote.update(where={"id": vote_id}, data=new_totals)
+
+        success_count = len(desired)
         logger.info(
-            f"Vote {vote_id}: {success_count} member votes inserted, {fail_count} failed. "
-            f"Totals: Y:{total_yea} N:{total_nay} P:{total_present} NV:{total_not_voting}"
+            f"Vote {vote_id}: {len(to_insert)} member votes inserted, "
+            f"{len(to_update)} updated, {len(to_delete)} deleted, {fail_count} failed. "
+            f"Totals: Y:{totals['YEA']} N:{totals['NAY']} P:{totals['PRESENT']} "
+            f"NV:{totals['NOT_VOTING']}{'' if totals_changed else ' (unchanged)'}"
         )
         return (success_count, fail_count)
 
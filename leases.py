@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from insert import prisma
+
+# ── Config ────────────────────────────────────────────────────────────────────
+LEASE_BATCH_SIZE = 50  # Bills per lease
+LEASE_TTL = 300  # Seconds a claim lasts without a heartbeat
+LEASE_MAX_ATTEMPTS = 5  # Claims before a batch is left for a human to look at
+
+logger = logging.getLogger(__name__)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _placeholders(values) -> str:
+    return ", ".join("?" for _ in values)
+
+
+class Lease:
+    """A claimed batch of bills; tracks when every bill in it has been processed."""
+
+    def __init__(self, lease_id: int, congress: int, batch: int, bills: list[dict], token: str):
+        self.id = lease_id
+        self.congress = congress
+        self.batch = batch
+        self.bills = bills
+        self.token = token
+        self.remaining = len(bills)
+        self.failed = 0
+        self.finished = asyncio.Event()
+        if not bills:
+            self.finished.set()
+
+    def bill_done(self, ok: bool):
+        if not ok:
+            self.failed += 1
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.finished.set()
+
+
+class LeaseStore:
+    """
+    Batches of bill refs in the IngestLease table, shared by any number of
+    worker processes on any number of hosts.
+
+    A claim is a single conditional UPDATE ... LIMIT 1, so two workers can
+    never hold the same batch. A claim expires after LEASE_TTL seconds
+    unless it is renewed, so the batches of a crashed worker are picked up
+    again. Every write after the claim is checked against the claim token.
+    """
+
+    def __init__(self, owner: str | None = None):
+        self.owner = owner or worker_id()
+
+    async def seed(self, congress: int, bills: list[dict]) -> int:
+        """Replace the congress's batches with `bills`; returns the batch count."""
+        refs = [
+            {
+                "congress": bill.get("congress"),
+                "type": bill.get("type"),
+                "number": bill.get("number"),
+                "updateDate": bill.get("updateDate"),
+            }
+            for bill in bills
+        ]
+        batches = [
+            refs[start : start + LEASE_BATCH_SIZE]
+            for start in range(0, len(refs), LEASE_BATCH_SIZE)
+        ]
+        async with prisma.tx() as tx:
+            await tx.ingestlease.delete_many(where={"congress": congress})
+            if batches:
+                await tx.ingestlease.create_many(
+                    data=[
+                        {
+                            "congress": congress,
+                            "batch": number,
+                            "billRefs": json.dumps(batch),
+                            "billCount": len(batch),
+                        }
+                        for number, batch in enumerate(batches)
+                    ]
+                )
+        logger.info(
+            f"Congress {congress}: seeded {len(refs)} bills in {len(batches)} lease batches"
+        )
+        return len(batches)
+
+    async def claim(self, congresses: list[int]) -> Lease | None:
+        """Claim the next pending (or expired) batch, or None if there is none."""
+        token = uuid.uuid4().hex
+        claimed = await prisma.execute_raw(
+            "UPDATE ingestlease SET status = 'leased', owner = ?, leaseToken = ?, "
+            "leaseExpiresAt = DATE_ADD(UTC_TIMESTAMP(3), INTERVAL ? SECOND), "
+            "attempts = attempts + 1, updatedAt = UTC_TIMESTAMP(3) "
+            f"WHERE congress IN ({_placeholders(congresses)}) AND attempts < ? "
+            "AND (status = 'pending' OR (status = 'leased' AND leaseExpiresAt < UTC_TIMESTAMP(3))) "
+            "ORDER BY congress, batch LIMIT 1",
+            self.owner,
+            token,
+            LEASE_TTL,
+            *congresses,
+            LEASE_MAX_ATTEMPTS,
+        )
+        if not claimed:
+            return None
+        rows = await prisma.query_raw(
+            "SELECT id, congress, batch, billRefs, attempts FROM ingestlease WHERE leaseToken = ?",
+            token,
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        if row["attempts"] > 1:
+            logger.info(
+                f"Reclaimed expired lease: congress {row['congress']} batch {row['batch']} "
+                f"(attempt {row['attempts']})"
+            )
+        return Lease(row["id"], row["congress"], row["batch"], json.loads(row["billRefs"]), token)
+
+    async def renew(self, lease: Lease) -> bool:
+        """Extend the claim; False means it expired and another worker took it."""
+        renewed = await prisma.execute_raw(
+            "UPDATE ingestlease SET leaseExpiresAt = DATE_ADD(UTC_TIMESTAMP(3), INTERVAL ? SECOND), "
+            "updatedAt = UTC_TIMESTAMP(3) WHERE id = ? AND leaseToken = ? AND status = 'leased'",
+            LEASE_TTL,
+            lease.id,
+            lease.token,
+        )
+        return bool(renewed)
+
+    async def complete(self, lease: Lease) -> bool:
+        done = len(lease.bills) - lease.failed
+        completed = await prisma.execute_raw(
+            "UPDATE ingestlease SET status = 'done', owner = NULL, leaseExpiresAt = NULL, "
+            "billsDone = ?, billsFailed = ?, finishedAt = UTC_TIMESTAMP(3), "
+            "updatedAt = UTC_TIMESTAMP(3) WHERE id = ? AND leaseToken = ?",
+            done,
+            lease.failed,
+            lease.id,
+            lease.token,
+        )
+        if not completed:
+            logger.warning(
+                f"Lost lease on congress {lease.congress} batch {lease.batch} before completing it"
+            )
+        return bool(completed)
+
+    async def outstanding(self, congresses: list[int]) -> int:
+        """
+        Batches that still need a worker: claimable now, or held by a live
+        lease. Batches that used up LEASE_MAX_ATTEMPTS don't count.
+        """
+        rows = await prisma.query_raw(
+            "SELECT COUNT(*) AS outstanding FROM ingestlease "
+            f"WHERE congress IN ({_placeholders(congresses)}) AND status <> 'done' "
+            "AND (attempts < ? OR (status = 'leased' AND leaseExpiresAt >= UTC_TIMESTAMP(3)))",
+            *congresses,
+            LEASE_MAX_ATTEMPTS,
+        )
+        return int(rows[0]["outstanding"]) if rows else 0
+
+    async def status(self, congresses: list[int]) -> dict:
+        """Aggregate progress per congress plus the workers holding live leases."""
+        by_status = await prisma.query_raw(
+            "SELECT congress, status, COUNT(*) AS batches, SUM(billCount) AS bills, "
+            "SUM(billsDone) AS billsDone, SUM(billsFailed) AS billsFailed, "
+            "SUM(leaseExpiresAt < UTC_TIMESTAMP(3)) AS expired, "
+            "SUM(attempts >= ?) AS exhausted "
+            f"FROM ingestlease WHERE congress IN ({_placeholders(congresses)}) "
+            "GROUP BY congress, status",
+            LEASE_MAX_ATTEMPTS,
+            *congresses,
+        )
+        owners = await prisma.query_raw(
+            "SELECT owner, COUNT(*) AS batches, SUM(billCount) AS bills, "
+            "MIN(leaseExpiresAt) AS nextExpiry FROM ingestlease "
+            f"WHERE congress IN ({_placeholders(congresses)}) AND status = 'leased' "
+            "AND leaseExpiresAt >= UTC_TIMESTAMP(3) GROUP BY owner ORDER BY owner",
+            *congresses,
+        )
+
+        summary: dict[int, dict] = {}
+        for row in by_status:
+            entry = summary.setdefault(
+                row["congress"],
+                {
+                    "batches": 0,
+                    "bills": 0,
+                    "pending": 0,
+                    "leased": 0,
+                    "expired": 0,
+                    "exhausted": 0,
+                    "done": 0,
+                    "billsDone": 0,
+                    "billsFailed": 0,
+                },
+            )
+            batches = int(row["batches"] or 0)
+            entry["batches"] += batches
+            entry["bills"] += int(row["bills"] or 0)
+            entry["billsDone"] += int(row["billsDone"] or 0)
+            entry["billsFailed"] += int(row["billsFailed"] or 0)
+            if row["status"] == "done":
+                entry["done"] += batches
+            else:
+                entry["exhausted"] += int(row["exhausted"] or 0)
+                if row["status"] == "leased":
+                    expired = int(row["expired"] or 0)
+                    entry["expired"] += expired
+                    entry["leased"] += batches - expired
+                else:
+                    entry["pending"] += batches
+        return {"congresses": summary, "workers": owners}
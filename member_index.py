@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import os
+from typing import NamedTuple
+from dotenv import load_dotenv
+import http_client
+from http_client import API_BASE_URL
+from insert import prisma
+
+load_dotenv()
+
+CONGRESS_API_KEY = os.getenv("CONGRESS_API_KEY")
+
+logger = logging.getLogger(__name__)
+
+
+class MemberRef(NamedTuple):
+    """What vote ingestion needs from a CongressMember."""
+
+    id: int
+    party: str | None
+    state: str | None
+
+
+def _member_fields(member: dict) -> dict:
+    """CongressMember columns from a /member/{bioguideId} payload."""
+    party_history = member.get("partyHistory") or []
+    party = party_history[-1].get("partyName") if party_history else None
+    return {
+        "name": member.get("directOrderName"),
+        "firstName": member.get("firstName"),
+        "lastName": member.get("lastName"),
+        "honorificName": member.get("honorificName"),
+        "birthYear": member.get("birthYear"),
+        "state": member.get("state"),
+        "party": party,
+        "active": bool(member.get("currentMember")),
+    }
+
+
+class MemberIndex:
+    """
+    bioguideId -> MemberRef for every CongressMember, loaded with one narrow
+    query instead of full Prisma models.
+
+    Unknown bioguide IDs are resolved lazily in batches: first from the DB
+    (members added since the load), then from /member/{bioguideId}, which
+    also stores the member. Concurrent callers asking for the same unknown
+    IDs share a single lookup, and IDs the API does not know are remembered
+    for the rest of the run.
+    """
+
+    def __init__(self):
+        self._members: dict[str, MemberRef] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+        self._not_found: set[str] = set()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def get(self, bioguide_id: str) -> MemberRef | None:
+        return self._members.get(bioguide_id)
+
+    async def load(self):
+        if self._loaded:
+            return
+        rows = await prisma.query_raw(
+            "SELECT id, bioguideId, party, state FROM congressmember"
+        )
+        for row in rows:
+            self._members[row["bioguideId"]] = MemberRef(row["id"], row["party"], row["state"])
+        self._loaded = True
+        logger.info(f"Loaded {len(self._members)} members into the member index")
+
+    async def resolve(self, bioguide_ids) -> dict[str, MemberRef]:
+        """MemberRefs for the given IDs, loading any unknown ones first."""
+        bioguide_ids = set(bioguide_ids)
+        unknown = {
+            b for b in bioguide_ids if b not in self._members and b not in self._not_found
+        }
+
+        waiting = {self._pending[b] for b in unknown if b in self._pending}
+        new = sorted(b for b in unknown if b not in self._pending)
+        if new:
+            task = asyncio.ensure_future(self._load_missing(new))
+            for b in new:
+                self._pending[b] = task
+
+            def _forget(_):
+                for b in new:
+                    self._pending.pop(b, None)
+
+            task.add_done_callback(_forget)
+            waiting.add(task)
+
+        if waiting:
+            # shield: one caller being cancelled must not cancel a shared lookup
+            await asyncio.gather(
+                *[asyncio.shield(task) for task in waiting], return_exceptions=True
+            )
+        return {b: self._members[b] for b in bioguide_ids if b in self._members}
+
+    async def _load_missing(self, bioguide_ids: list[str]):
+        placeholders = ", ".join("?" for _ in bioguide_ids)
+        rows = await prisma.query_raw(
+            f"SELECT id, bioguideId, party, state FROM congressmember "
+            f"WHERE bioguideId IN ({placeholders})",
+            *bioguide_ids,
+        )
+        for row in rows:
+            self._members[row["bioguideId"]] = MemberRef(row["id"], row["party"], row["state"])
+
+        still_missing = [b for b in bioguide_ids if b not in self._members]
+        if still_missing:
+            await asyncio.gather(*[self._fetch_member(b) for b in still_missing])
+        logger.info(
+            f"Member index: resolved {len(rows)} of {len(bioguide_ids)} unknown members "
+            f"from the DB, {len(still_missing)} from the API"
+        )
+
+    async def _fetch_member(self, bioguide_id: str):
+        url = f"{API_BASE_URL}/member/{bioguide_id}"
+        params = {"api_key": CONGRESS_API_KEY, "format": "json"}
+        try:
+            response = await http_client.get(url, params)
+        except http_client.RequestError as e:
+            logger.error(f"request error fetching member {bioguide_id}: {e}")
+            return
+        if response.status_code == 404:
+            logger.warning(f"Congress member {bioguide_id} not found in the API")
+            self._not_found.add(bioguide_id)
+            return
+        if response.status_code != 200:
+            logger.error(f"HTTP {response.status_code} fetching member {bioguide_id}")
+            return
+
+        member = response.json().get("member")
+        if not member:
+            self._not_found.add(bioguide_id)
+            return
+        fields = _member_fields(member)
+        row = await prisma.congressmember.upsert(
+            where={"bioguideId": bioguide_id},
+            data={"create": {"bioguideId": bioguide_id, **fields}, "update": fields},
+        )
+        self._members[bioguide_id] = MemberRef(row.id, row.party, row.state)
+        logger.info(f"Added congress member {bioguide_id} from the API")
+
+
+member_index = MemberIndex()
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ── Config ────────────────────────────────────────────────────────────────────
+HOURLY_QUOTA = int(os.getenv("CONGRESS_API_HOURLY_QUOTA", "5000"))  # api.data.gov default
+BURST = int(os.getenv("CONGRESS_API_BURST", "10"))  # Tokens that may be spent back-to-back
+# Processes sharing one API key (e.g. sharded --worker runs); each gets 1/N of the quota
+API_KEY_WORKERS = max(1, int(os.getenv("CONGRESS_API_WORKERS", "1")))
+QUOTA_RESERVE = 25  # Remaining-requests floor before we start throttling to the header
+MIN_429_BACKOFF = 60  # First pause when a 429 arrives without Retry-After
+MAX_429_BACKOFF = 60 * 30  # Never pause longer than the old fixed 30 minute sleep
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """
+    Process-wide token bucket shared by every coroutine that talks to the API.
+
+    Tokens refill continuously at `requests_per_hour / 3600` per second, so a
+    long backfill runs at the quota instead of bursting into 429s. When
+    `workers` processes share the key, each refills at 1/workers of that.
+    `pause()` stops every caller at once; the next `acquire()` from any
+    worker waits out the same deadline.
+    """
+
+    def __init__(self, requests_per_hour: int, burst: int, workers: int = 1):
+        self.workers = max(1, workers)
+        self.rate = requests_per_hour / self.workers / 3600
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._consecutive_429s = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self):
+        """Wait until a request may be sent. FIFO across waiters."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stop all workers for `seconds` (extends, never shortens, a pause)."""
+        now = time.monotonic()
+        until = now + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+        self._tokens = 0.0
+        self._updated = now
+
+    def on_success(self, headers):
+        """Sync the bucket with the quota headers the server reports."""
+        self._consecutive_429s = 0
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+
+        if limit and abs(limit / self.workers / 3600 - self.rate) > 1e-9:
+            logger.info(f"API reports hourly limit {limit}; adjusting rate limiter")
+            self.rate = limit / self.workers / 3600
+
+        if remaining is None:
+            return
+        if remaining <= 0:
+            # The quota is a rolling hour; spread the next requests over it
+            self.pause(1 / self.rate)
+        elif remaining < QUOTA_RESERVE:
+            self._tokens = min(self._tokens, 0.0)
+
+    def on_429(self, headers) -> float:
+        """Pause everyone for Retry-After (or an escalating backoff) and return it."""
+        delay = parse_retry_after(headers.get("Retry-After") if headers else None)
+        now = time.monotonic()
+        if delay is None and now < self._paused_until:
+            # Another worker already hit the same 429 wave; share its pause
+            return self._paused_until - now
+        self._consecutive_429s += 1
+        if delay is None:
+            delay = min(
+                MAX_429_BACKOFF, MIN_429_BACKOFF * 2 ** (self._consecutive_429s - 1)
+            )
+        self.pause(delay)
+        return delay
+
+
+def _int_header(headers, name: str) -> int | None:
+    if not headers:
+        return None
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+limiter = RateLimiter(HOURLY_QUOTA, BURST, API_KEY_WORKERS)
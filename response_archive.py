@@ -0,0 +1,209 @@
+import fcntl
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+from response_cache import EXCLUDED_PARAMS
+
+load_dotenv()
+
+# ── Config ────────────────────────────────────────────────────────────────────
+ARCHIVE_ENABLED = os.getenv("RESPONSE_ARCHIVE", "true").lower() == "true"
+ARCHIVE_DIR = Path(os.getenv("RESPONSE_ARCHIVE_DIR", "archive"))
+SEGMENT_MAX_BYTES = int(os.getenv("RESPONSE_ARCHIVE_SEGMENT_MB", "256")) * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_RE = re.compile(r"^segment-(\d{6})\.jsonl\.gz$")
+
+
+def classify(url: str) -> tuple[str, str | None]:
+    """
+    (endpoint, subject) for a Congress.gov URL, e.g.
+    /bill/118/hr/1/actions -> ("bill-actions", "118HR1"),
+    /house-vote/118/1/5/members -> ("house-vote-members", "118-1-5").
+    """
+    parts = urlparse(url).path.strip("/").split("/")
+    if parts and parts[0] == "v3":
+        parts = parts[1:]
+    if not parts:
+        return "unknown", None
+
+    resource = parts[0]
+    if resource == "bill":
+        if len(parts) <= 2:
+            return "bill-list", parts[1] if len(parts) == 2 else None
+        if len(parts) >= 4:
+            subject = f"{parts[1]}{parts[2].upper()}{parts[3]}"
+            if len(parts) == 4:
+                return "bill-details", subject
+            return f"bill-{parts[4]}", subject
+    if resource == "house-vote":
+        if len(parts) <= 2:
+            return "house-vote-list", parts[1] if len(parts) == 2 else None
+        if len(parts) >= 4:
+            subject = f"{parts[1]}-{parts[2]}-{parts[3]}"
+            if parts[-1] == "members":
+                return "house-vote-members", subject
+            return "house-vote", subject
+    if resource == "member" and len(parts) >= 2:
+        return "member", parts[1]
+    return resource, None
+
+
+class ResponseArchive:
+    """
+    Append-only archive of raw API responses.
+
+    Responses go into gzip segment files under `directory`. Each record is
+    its own gzip member, so it can be read back alone from its byte offset.
+    A segment rolls over once it passes `segment_max_bytes`. A SQLite index
+    maps the request key (as used by the response cache), the endpoint and
+    the bill or roll call to each record's location. Several processes may
+    append to the same archive (sharded workers on one host): each write
+    holds an flock on the segment and takes its offset from the end of the
+    file rather than from this process's handle.
+    """
+
+    def __init__(self, directory: Path, segment_max_bytes: int):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self._index: sqlite3.Connection | None = None
+        self._segment_number = 0
+        self._segment = None
+        self.records_written = 0
+
+    def open(self):
+        if self._index is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index = sqlite3.connect(self.directory / "index.sqlite", timeout=30)
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                subject TEXT,
+                url TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._index.execute("CREATE INDEX IF NOT EXISTS records_key ON records (key)")
+        self._index.execute(
+            "CREATE INDEX IF NOT EXISTS records_endpoint_subject ON records (endpoint, subject)"
+        )
+        self._index.commit()
+
+        existing = [
+            int(m.group(1))
+            for m in (_SEGMENT_RE.match(p.name) for p in self.directory.iterdir())
+            if m
+        ]
+        self._segment_number = max(existing, default=0)
+        logger.info(
+            f"opened response archive {self.directory} (segment {self._segment_number})"
+        )
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        if self._index is not None:
+            if self.records_written:
+                logger.info(f"archived {self.records_written} responses")
+            self._index.close()
+            self._index = None
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"segment-{number:06d}.jsonl.gz"
+
+    def _write(self, payload: bytes) -> tuple[int, int]:
+        """Append one record under the segment lock; returns (segment, offset)."""
+        while True:
+            if self._segment is None:
+                self._segment = self._segment_path(self._segment_number).open("ab")
+            segment = self._segment
+            fcntl.flock(segment, fcntl.LOCK_EX)
+            try:
+                # Other processes may have appended to (or filled) the segment
+                offset = segment.seek(0, os.SEEK_END)
+                if offset < self.segment_max_bytes:
+                    segment.write(payload)
+                    segment.flush()
+                    return self._segment_number, offset
+            finally:
+                fcntl.flock(segment, fcntl.LOCK_UN)
+            segment.close()
+            self._segment = None
+            self._segment_number += 1
+
+    def has(self, key: str) -> bool:
+        if self._index is None:
+            return False
+        row = self._index.execute(
+            "SELECT 1 FROM records WHERE key = ? LIMIT 1", (key,)
+        ).fetchone()
+        return row is not None
+
+    def append(self, key: str, url: str, params: dict | None, body: bytes):
+        if self._index is None:
+            return
+        endpoint, subject = classify(url)
+        fetched_at = time.time()
+        record = {
+            "key": key,
+            "url": url,
+            "params": {
+                k: v
+                for k, v in (params or {}).items()
+                if k not in EXCLUDED_PARAMS and v is not None
+            },
+            "endpoint": endpoint,
+            "subject": subject,
+            "fetched_at": fetched_at,
+            "body": body.decode("utf-8", errors="replace"),
+        }
+        payload = gzip.compress((json.dumps(record) + "\n").encode("utf-8"))
+
+        segment_number, offset = self._write(payload)
+
+        self._index.execute(
+            """
+            INSERT INTO records (key, endpoint, subject, url, segment, offset, length, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, endpoint, subject, url, segment_number, offset, len(payload), fetched_at),
+        )
+        self._index.commit()
+        self.records_written += 1
+
+    def read(self, key: str) -> bytes | None:
+        """Body of the most recent record for a request key."""
+        if self._index is None:
+            return None
+        row = self._index.execute(
+            "SELECT segment, offset, length FROM records WHERE key = ? ORDER BY id DESC LIMIT 1",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        segment, offset, length = row
+        with self._segment_path(segment).open("rb") as f:
+            f.seek(offset)
+            record = json.loads(gzip.decompress(f.read(length)))
+        return record["body"].encode("utf-8")
+
+
+archive = ResponseArchive(ARCHIVE_DIR, SEGMENT_MAX_BYTES)
@@ -0,0 +1,236 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from datetime import date
+from pathlib import Path
+from urllib.parse import urlencode, urlparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ── Config ────────────────────────────────────────────────────────────────────
+CACHE_ENABLED = os.getenv("HTTP_CACHE", "true").lower() == "true"
+CACHE_PATH = Path(os.getenv("HTTP_CACHE_PATH", "cache/http_cache.sqlite"))
+CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_MB", "2048")) * 1024 * 1024
+
+# Per-endpoint freshness (seconds). Within the TTL no request is sent at all;
+# after it, the entry is revalidated with If-None-Match / If-Modified-Since.
+LIST_TTL = 15 * 60  # /bill/{congress}, /house-vote/{congress}: new items appear constantly
+OPEN_CONGRESS_TTL = 6 * 60 * 60  # Bill details/actions/summaries in the current congress
+CLOSED_CONGRESS_TTL = 30 * 24 * 60 * 60  # Past congresses barely change
+OPEN_ROLL_CALL_TTL = 24 * 60 * 60  # Member votes are only corrected occasionally
+CLOSED_ROLL_CALL_TTL = 365 * 24 * 60 * 60
+MEMBER_TTL = 24 * 60 * 60  # /member/{bioguideId}
+
+EXCLUDED_PARAMS = {"api_key"}
+
+logger = logging.getLogger(__name__)
+
+
+def current_congress(today: date | None = None) -> int:
+    """
+    The 1st Congress started in 1789; each one spans two years and, since
+    1935, begins on January 3 of an odd year.
+    """
+    today = today or date.today()
+    year = today.year
+    if year % 2 == 1 and today < date(year, 1, 3):
+        year -= 1  # The previous congress is still in session
+    return (year - 1789) // 2 + 1
+
+
+def cache_key(url: str, params: dict | None) -> str:
+    """Normalized URL + params (minus the api_key), hashed."""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/").lower()
+    items = sorted(
+        (k, str(v))
+        for k, v in (params or {}).items()
+        if k not in EXCLUDED_PARAMS and v is not None
+    )
+    raw = f"{parsed.netloc.lower()}{path}?{urlencode(items)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def ttl_for(url: str) -> float:
+    """Freshness window for a Congress.gov URL, based on endpoint and congress."""
+    parts = urlparse(url).path.strip("/").lower().split("/")
+    if parts and parts[0] == "v3":
+        parts = parts[1:]
+    if not parts:
+        return 0
+
+    resource = parts[0]
+    congress = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+    closed = congress is not None and congress < current_congress()
+
+    if resource == "member":
+        return MEMBER_TTL
+    if resource in ("bill", "house-vote") and len(parts) <= 2:
+        return LIST_TTL
+    if resource == "house-vote" and parts[-1] == "members":
+        return CLOSED_ROLL_CALL_TTL if closed else OPEN_ROLL_CALL_TTL
+    return CLOSED_CONGRESS_TTL if closed else OPEN_CONGRESS_TTL
+
+
+class CachedEntry:
+    def __init__(self, body: bytes, etag, last_modified, fetched_at: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def is_fresh(self, ttl: float, changed_since: float | None = None) -> bool:
+        """
+        Within the TTL, unless the resource is known to have changed
+        (`changed_since`, a timestamp) after the body was fetched.
+        """
+        if changed_since is not None and self.fetched_at < changed_since:
+            return False
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded LRU cache of successful GET bodies in SQLite.
+    Bodies are zlib-compressed; the least recently used entries are evicted
+    once the total compressed size passes `max_bytes`.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db: sqlite3.Connection | None = None
+        self._total_bytes = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def open(self):
+        if self._db is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._db.commit()
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes = row[0]
+        logger.info(
+            f"opened HTTP cache {self.path} ({self._total_bytes / 1024 / 1024:.1f} MB)"
+        )
+
+    def close(self):
+        if self._db is None:
+            return
+        logger.info(
+            f"HTTP cache: {self.hits} fresh hits, {self.revalidated} revalidated, "
+            f"{self.misses} misses"
+        )
+        self._db.close()
+        self._db = None
+
+    def lookup(self, key: str) -> CachedEntry | None:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        self._db.execute(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+        self._db.commit()
+        return CachedEntry(zlib.decompress(row[0]), row[1], row[2], row[3])
+
+    def mark_revalidated(self, key: str):
+        """A 304 came back: the stored body is fresh again."""
+        if self._db is None:
+            return
+        now = time.time()
+        self._db.execute(
+            "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+            (now, now, key),
+        )
+        self._db.commit()
+
+    def store(self, key: str, url: str, body: bytes, headers):
+        if self._db is None:
+            return
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        previous = self._db.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        self._db.execute(
+            """
+            INSERT OR REPLACE INTO responses
+                (key, url, body, size, etag, last_modified, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key,
+                url,
+                compressed,
+                len(compressed),
+                headers.get("ETag") if headers else None,
+                headers.get("Last-Modified") if headers else None,
+                now,
+                now,
+            ),
+        )
+        self._db.commit()
+        self._total_bytes += len(compressed) - (previous[0] if previous else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until we are 10% under the cap."""
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        )
+        doomed = []
+        for key, size in rows:
+            if self._total_bytes - freed <= target:
+                break
+            doomed.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self._db.commit()
+        self._total_bytes -= freed
+        logger.info(f"HTTP cache evicted {len(doomed)} entries ({freed / 1024 / 1024:.1f} MB)")
+
+
+cache = ResponseCache(CACHE_PATH, CACHE_MAX_BYTES)
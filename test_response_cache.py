@@ -0,0 +1,16 @@
+from datetime import date
+import pytest
+from response_cache import current_congress
+
+
+@pytest.mark.parametrize(
+    "today, congress",
+    [
+        (date(2025, 1, 2), 118),
+        (date(2025, 1, 3), 119),
+        (date(2026, 1, 1), 119),
+        (date(2027, 1, 3), 120),
+    ],
+)
+def test_current_congress_starts_on_january_3(today, congress):
+    assert current_congress(today) == congress